@@ -0,0 +1,55 @@
+"""
+Walker/Vose alias table for constant-time fitness-proportional sampling.
+Building the table is O(n), after that every draw costs O(1).
+"""
+
+import numpy as np
+
+
+class AliasTable():
+    """ Alias table over a vector of non-negative weights.
+
+    """
+    def __init__(self, weights):
+        """ Build the table with Vose's algorithm.
+
+        :param weights: Weight of each candidate, e.g. fitness
+        :type weights: numpy.ndarray
+        """
+        weights = np.asarray(weights, dtype=float)
+        self.size = len(weights)
+        scaled = (weights * (self.size / weights.sum())).tolist()
+        probability = [1.0] * self.size
+        alias = list(range(self.size))
+        small = [i for i, value in enumerate(scaled) if value < 1]
+        large = [i for i, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+        # Leftovers only differ from 1 by rounding error, they keep their own
+        # column with probability 1.
+        self.probability = np.array(probability)
+        self.alias = np.array(alias, dtype=np.intp)
+
+    def sample(self, size, rng=None):
+        """ Draw indices proportional to the weights.
+
+        :param size: Number of draws
+        :type size: int
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :return: Selected indices
+        :rtype: numpy.ndarray
+        """
+        rng = np.random.default_rng(rng)
+        columns = rng.integers(0, self.size, size=size)
+        keep = rng.random(size) < self.probability[columns]
+        return np.where(keep, columns, self.alias[columns])
@@ -4,23 +4,90 @@ single-point, n-point and uniform. Each chromosome could be initialized by
 calling random or form_gen_list classmethod.
 """
 
-import random
+import functools
 import math
 
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def get_phenotype_weights(length):
+    """ Power-of-two weight of each gene when decoding ``length`` genes, the
+    first gene is the least significant bit.
+
+    :param length: Number of genes in one phenotype value
+    :type length: int
+    :return: Weight vector
+    :rtype: numpy.ndarray
+    """
+    weights = 2.0 ** np.arange(length)
+    weights.flags.writeable = False
+    return weights
+
+
+def get_geometric_positions(size, probability, rng=None):
+    """ Choose each position below size independently with the given
+    probability. Gaps between chosen positions are drawn from a geometric
+    distribution in batches, so the cost follows the number of chosen
+    positions rather than size.
+
+    :param size: Number of positions
+    :type size: int
+    :param probability: Probability of choosing each position
+    :type probability: float
+    :param rng: Random generator (or seed), defaults to None (a fresh
+    unseeded generator)
+    :type rng: numpy.random.Generator, optional
+    :return: Chosen positions in increasing order
+    :rtype: numpy.ndarray
+    """
+    rng = np.random.default_rng(rng)
+    if probability <= 0:
+        return np.empty(0, dtype=np.int64)
+    if probability >= 1:
+        return np.arange(size)
+    position_list = []
+    last = -1
+    while True:
+        expected = (size - last - 1) * probability
+        positions = last + np.cumsum(rng.geometric(
+            probability, size=int(expected + 4 * math.sqrt(expected)) + 16
+        ))
+        position_list.append(positions[positions < size])
+        if positions[-1] >= size:
+            return np.concatenate(position_list)
+        last = positions[-1]
+
 
 class Chromosome():
     """ Representation of a chromosome in both phenotype and genotype.
 
     """
+    # Optional FitnessCache consulted by calculate_fitness, shared by every
+    # chromosome unless overridden on an instance.
+    fitness_cache = None
+
     def __init__(self, genotype, minimum=-5, maximum=5):
         self.size = len(genotype)
         self.minimum = minimum
         self.maximum = maximum
         self.genotype = genotype
-        self.fitness = self.calculate_fitness()
+        self._fitness = None
+
+    @property
+    def fitness(self):
+        """ Fitness of the chromosome. It is calculated on first access and
+        cached until a gene is changed through indexing or mutation.
+
+        :return: Fitness of the chromosome
+        :rtype: float
+        """
+        if self._fitness is None:
+            self._fitness = self.calculate_fitness()
+        return self._fitness
 
     @classmethod
-    def random(cls, size, minimum=-5, maximum=5):
+    def random(cls, size, minimum=-5, maximum=5, rng=None):
         """ Create a random chromosome instance.
 
         :param size: Size of chromosome
@@ -29,15 +96,17 @@ class Chromosome():
         :type minimum: int, optional
         :param maximum: Maximum value in phenotype, defaults to 5
         :type maximum: int, optional
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: An instance of chromosome class
         :rtype: Chromosome
         """
         if size % 2 == 1:
             print("size can't be odd, increasing by 1 automatically")
             size += 1
-        genotype = []
-        for _ in range(size):
-            genotype.append(bool(random.getrandbits(1)))
+        rng = np.random.default_rng(rng)
+        genotype = rng.integers(0, 2, size).astype(bool).tolist()
         return cls(genotype, minimum, maximum)
 
     @classmethod
@@ -68,28 +137,58 @@ class Chromosome():
         return 1 if self.genotype[key] else 0
 
     def __setitem__(self, key, value):
-        self.genotype[key] = bool(int(value))
+        gen = bool(int(value))
+        if self.genotype[key] != gen:
+            self.genotype[key] = gen
+            self._fitness = None
 
     def __calculate_phenotype_value(self, gen_list):
-        raw_value = 0
-        for i, gen in enumerate(gen_list):
-            raw_value += gen * (2 ** i)
+        raw_value = float(
+            np.dot(gen_list, get_phenotype_weights(len(gen_list)))
+        )
         return (
             raw_value *
             ((self.maximum - self.minimum) / ((2 ** len(gen_list)) - 1))
             + self.minimum
         )
 
-    def __get_random_split_point_list(self, count):
+    @staticmethod
+    def decode_batch(genotypes, minimum=-5, maximum=5):
+        """ Decode x and y of many genotypes with one dot product per axis.
+
+        :param genotypes: Bit matrix, one genotype in each row
+        :type genotypes: numpy.ndarray
+        :param minimum: Minimum value in phenotype, defaults to -5
+        :type minimum: int, optional
+        :param maximum: Maximum value in phenotype, defaults to 5
+        :type maximum: int, optional
+        :return: A tuple of x and y arrays
+        :rtype: tuple
+        """
+        genotypes = np.asarray(genotypes, dtype=np.uint8)
+        half = genotypes.shape[-1] // 2
+        # Like get_x and get_y, y takes the extra gene of an odd genotype
+        return tuple(
+            genes @ get_phenotype_weights(genes.shape[-1])
+            * ((maximum - minimum) / ((2 ** genes.shape[-1]) - 1)) + minimum
+            for genes in (genotypes[..., :half], genotypes[..., half:])
+        )
+
+    def __get_random_split_point_list(self, count, rng=None):
         """ Generate random unique split points.
 
         :param count: Number of split points needed.
         :type count: int
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: Sorted list of random split points
         :rtype: list
         """
-        split_point_list = random.sample(range(1, self.size), count)
-        split_point_list.sort()
+        rng = np.random.default_rng(rng)
+        split_point_list = np.sort(
+            rng.choice(np.arange(1, self.size), count, replace=False)
+        ).tolist()
         split_point_list.insert(0, 0)
         split_point_list.append(self.size)
         return split_point_list
@@ -100,13 +199,26 @@ class Chromosome():
         :return: Ackley function output
         :rtype: float
         """
-        ackley_x = self.get_x()
-        ackley_y = self.get_y()
-        power1 = -0.2 * math.sqrt(0.5 * ((ackley_x ** 2) + (ackley_y ** 2)))
+        return float(
+            Chromosome.ackley_function(self.get_x(), self.get_y())
+        )
+
+    @staticmethod
+    def ackley_function(ackley_x, ackley_y):
+        """ Calculate ackley function element-wise over x and y arrays.
+
+        :param ackley_x: Values of x
+        :type ackley_x: numpy.ndarray
+        :param ackley_y: Values of y
+        :type ackley_y: numpy.ndarray
+        :return: Ackley function output
+        :rtype: numpy.ndarray
+        """
+        power1 = -0.2 * np.sqrt(0.5 * ((ackley_x ** 2) + (ackley_y ** 2)))
         power2 = +0.5 * (
-            math.cos(2 * math.pi * ackley_x) + math.cos(2 * math.pi * ackley_y)
+            np.cos(2 * math.pi * ackley_x) + np.cos(2 * math.pi * ackley_y)
         )
-        return -20 * math.exp(power1) - math.exp(power2) + math.e + 20
+        return -20 * np.exp(power1) - np.exp(power2) + math.e + 20
 
     def calculate_fitness(self, base=21):
         """ Calculate fitness by subtracting Ackley function value from 21,
@@ -118,7 +230,48 @@ class Chromosome():
         :return: Fitness of the chromosome
         :rtype: float
         """
-        return base - self.calculate_ackley_function()
+        if self.fitness_cache is None:
+            return base - self.calculate_ackley_function()
+        key = (
+            self.minimum, self.maximum, base, self.size,
+            self.packed_genotype()
+        )
+        fitness = self.fitness_cache.get(key)
+        if fitness is None:
+            fitness = base - self.calculate_ackley_function()
+            self.fitness_cache.put(key, fitness)
+        return fitness
+
+    def packed_genotype(self):
+        """ Pack the genotype into bytes, gene i being bit i, used as a
+        compact fitness cache key.
+
+        :return: Packed genotype
+        :rtype: bytes
+        """
+        return np.packbits(
+            np.array(self.genotype, dtype=bool), bitorder="little"
+        ).tobytes()
+
+    @classmethod
+    def evaluate_batch(cls, genotypes, minimum=-5, maximum=5, base=21):
+        """ Calculate fitness of many genotypes in one call, without creating
+        a chromosome for each of them.
+
+        :param genotypes: Bit matrix, one genotype in each row
+        :type genotypes: numpy.ndarray
+        :param minimum: Minimum value in phenotype, defaults to -5
+        :type minimum: int, optional
+        :param maximum: Maximum value in phenotype, defaults to 5
+        :type maximum: int, optional
+        :param base: Base of our fitness calculation, defaults to 21
+        :type base: int, optional
+        :return: Fitness of each genotype
+        :rtype: numpy.ndarray
+        """
+        return base - cls.ackley_function(
+            *cls.decode_batch(genotypes, minimum, maximum)
+        )
 
     def general_crossover(self, second_parent, split_point_list):
         """ Crossover with two parent chromosome and produce two children.
@@ -146,43 +299,54 @@ class Chromosome():
             self.from_gen_list(first_child), self.from_gen_list(second_child)
         )
 
-    def single_point_crossover(self, second_parent):
+    def single_point_crossover(self, second_parent, rng=None):
         """ Single point crossover.
 
         :param second_parent: Second parent
         :type second_parent: Chromosome
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: A tuple containing two children
         :rtype: tuple
         """
-        split_point_list = self.__get_random_split_point_list(1)
+        split_point_list = self.__get_random_split_point_list(1, rng)
         return self.general_crossover(second_parent, split_point_list)
 
-    def n_point_crossover(self, second_parent, count):
+    def n_point_crossover(self, second_parent, count, rng=None):
         """ N-Point crossover.
 
         :param second_parent: Second parent
         :type second_parent: Chromosome
         :param count: Number of split points
         :type count: int
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: A tuple containing two children
         :rtype: tuple
         """
-        split_point_list = self.__get_random_split_point_list(count)
+        split_point_list = self.__get_random_split_point_list(count, rng)
         return self.general_crossover(second_parent, split_point_list)
 
-    def uniform_crossover(self, second_parent):
+    def uniform_crossover(self, second_parent, rng=None):
         """ Uniform crossover, each bit is chosen from either parent.
 
         :param second_parent: Second parent
         :type second_parent: Chromosome
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: A tuple containing two children
         :rtype: tuple
         """
+        rng = np.random.default_rng(rng)
         first_parent = self
         first_child = []
         second_child = []
-        for i, j in zip(first_parent, second_parent):
-            if bool(random.getrandbits(1)):
+        bits = rng.integers(0, 2, self.size).tolist()
+        for i, j, bit in zip(first_parent, second_parent, bits):
+            if bit:
                 first_child.append(i)
                 second_child.append(j)
             else:
@@ -192,38 +356,60 @@ class Chromosome():
             self.from_gen_list(first_child), self.from_gen_list(second_child)
         )
 
-    def crossover(self, second_parent, method):
+    def crossover(self, second_parent, method, rng=None):
         """ Crossover with chosen method (n_point, single_point, uniform).
 
         :param second_parent: Second parent
         :type second_parent: Chromosome
         :param method: Method for crossover
         :type method: str
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         """
         if method == "uniform":
-            return self.uniform_crossover(second_parent)
+            return self.uniform_crossover(second_parent, rng)
         if method.split('_')[0] == "single":
-            return self.single_point_crossover(second_parent)
+            return self.single_point_crossover(second_parent, rng)
         if method.split('_')[0].isnumeric():
             return self.n_point_crossover(
-                second_parent, int(method.split('_')[0])
+                second_parent, int(method.split('_')[0]), rng
             )
         return False
 
-    def mutation(self, selection_probability, gene_probability):
+    def mutation(
+            self, selection_probability, gene_probability, method="per_gene",
+            rng=None
+    ):
         """ Perform mutation on chromosome
 
         :param selection_probability: Probability of selecting a chromosome
         :type selection_probability: float
         :param gene_probability: Probability of changing each gene
         :type gene_probability: float
+        :param method: "per_gene" draws a random number for every gene,
+        "geometric" jumps straight to the flipped genes, defaults to
+        "per_gene"
+        :type method: str, optional
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         """
-        if random.random() > selection_probability:
+        rng = np.random.default_rng(rng)
+        if rng.random() > selection_probability:
             return
-        for i in range(self.size):
-            if random.random() <= gene_probability:
-                self.genotype[i] = not self.genotype[i]
-        self.fitness = self.calculate_fitness()
+        if method == "geometric":
+            position_list = get_geometric_positions(
+                self.size, gene_probability, rng
+            ).tolist()
+        else:
+            position_list = np.flatnonzero(
+                rng.random(self.size) <= gene_probability
+            ).tolist()
+        for i in position_list:
+            self.genotype[i] = not self.genotype[i]
+        if position_list:
+            self._fitness = None
 
     def get_x(self):
         """ Get value of x in phenotype space.
@@ -0,0 +1,70 @@
+"""
+Bounded fitness memoization keyed by packed genotype. When the population
+converges the genetic algorithm keeps producing identical genotypes, and an
+expensive objective does not have to be evaluated for them again.
+"""
+
+from collections import OrderedDict
+
+
+class FitnessCache():
+    """ Least recently used cache from genotype keys to fitness values.
+
+    """
+    def __init__(self, max_size=4096):
+        """ Initialize an empty cache.
+
+        :param max_size: Maximum number of cached genotypes, the least
+        recently used one is evicted beyond it, defaults to 4096
+        :type max_size: int, optional
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def get(self, key):
+        """ Look a genotype up and count the hit or miss.
+
+        :param key: Genotype key
+        :type key: tuple
+        :return: Cached fitness, or None when the genotype is not cached
+        :rtype: float
+        """
+        fitness = self.__entries.get(key)
+        if fitness is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return fitness
+
+    def put(self, key, fitness):
+        """ Store fitness of a genotype, evicting the least recently used
+        entries when the cache is full.
+
+        :param key: Genotype key
+        :type key: tuple
+        :param fitness: Fitness of the genotype
+        :type fitness: float
+        """
+        self.__entries[key] = fitness
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        """ Remove every entry and reset the counters.
+
+        :return: NoneType
+        :rtype: NoneType
+        """
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -2,9 +2,25 @@
 Genetic algorithm implementation for Ackley function.
 """
 
-import random
+import os
+import sys
 
-from chromosome import Chromosome
+import numpy as np
+
+# sampling.py is shared with differential evolution, so scripts run from this
+# directory find it too
+_SAMPLING_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "differential_evolution"
+)
+if _SAMPLING_DIRECTORY not in sys.path:
+    sys.path.append(_SAMPLING_DIRECTORY)
+
+from alias_table import AliasTable  # noqa: E402
+from chromosome import Chromosome  # noqa: E402
+from fitness_cache import FitnessCache  # noqa: E402
+from population import Population  # noqa: E402
+from sampling import sample_without_replacement  # noqa: E402
 
 
 class Genetic:
@@ -12,7 +28,11 @@ class Genetic:
 
     """
 
-    def __init__(self, chromosome_size, population_size, generation_count):
+    def __init__(
+            self, chromosome_size, population_size, generation_count,
+            fitness_cache_size=None, evaluator=None, rng=None,
+            genotypes=None, fitness=None
+    ):
         """ Initialize an instance of genetic class.
         :param chromosome_size: Size of each binary chromosome.
         :type chromosome_size: int
@@ -20,14 +40,45 @@ class Genetic:
         :type population_size: int
         :param generation_count: Number of generations
         :type generation_count: int
+        :param fitness_cache_size: Number of genotypes whose fitness is
+        memoized, least recently used ones are evicted, defaults to None (no
+        cache)
+        :type fitness_cache_size: int, optional
+        :param evaluator: Evaluator fitness batches are sent to, such as a
+        PoolEvaluator from evaluator.py, defaults to None (evaluate in this
+        thread)
+        :type evaluator: PoolEvaluator, optional
+        :param rng: Random generator, or a seed (int or
+        numpy.random.SeedSequence) to create one from, every random draw of
+        the run comes from it, defaults to None (a fresh unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :param genotypes: Bit matrix of the first generation, defaults to None
+        (a random population)
+        :type genotypes: numpy.ndarray, optional
+        :param fitness: Already known fitness of each row of genotypes,
+        defaults to None (evaluate them)
+        :type fitness: numpy.ndarray, optional
         """
         self.chromosome_size = chromosome_size
         self.population_size = population_size
         self.generation_count = generation_count
-        self.current_generation = self.initialize_population()
-        self.next_generation = list()
+        self.fitness_cache_size = fitness_cache_size
+        self.fitness_cache = None
+        if fitness_cache_size is not None:
+            self.fitness_cache = FitnessCache(fitness_cache_size)
+        self.evaluator = evaluator
+        self.rng = np.random.default_rng(rng)
+        self.current_generation = self.initialize_population(
+            genotypes, fitness
+        )
+        self.next_generation = None
+        self.alias_table = None
         self.generation_max_fitness = list()
         self.generation_average_fitness = list()
+        self.evaluation_count = population_size
+        self.generations_run = 0
+        self.start_generation = 0
+        self.stopped_by = None
         self.best_chromosome = Genetic.find_best_chromosome(
             self.current_generation
         )
@@ -35,23 +86,126 @@ class Genetic:
             self.current_generation
         )
 
-    def initialize_population(self):
-        """ Initialize random population.
+    @classmethod
+    def from_state(cls, state, evaluator=None):
+        """ Rebuild a run from a checkpoint state, the next call to run
+        continues from the generation after the checkpoint with the saved
+        random generator.
+
+        :param state: Dict handed to checkpoint.save by run, e.g. from
+        checkpoint.load
+        :type state: dict
+        :param evaluator: Evaluator fitness batches are sent to, defaults to
+        None (evaluate in this thread)
+        :type evaluator: PoolEvaluator, optional
+        :return: Genetic algorithm at the checkpointed generation
+        :rtype: Genetic
+        """
+        genetic = cls(
+            state["chromosome_size"], state["population_size"],
+            state["generation_count"], state.get("fitness_cache_size"),
+            evaluator, state["rng"], state["genotypes"], state["fitness"]
+        )
+        genetic.best_chromosome = Chromosome.from_gen_list(
+            state["best_genotype"].tolist()
+        )
+        genetic.best_chromosome._fitness = state["best_fitness"]
+        genetic.generation_max_fitness = state[
+            "generation_max_fitness"
+        ].tolist()
+        genetic.generation_average_fitness = state[
+            "generation_average_fitness"
+        ].tolist()
+        genetic.evaluation_count = state["evaluation_count"]
+        genetic.generations_run = state["generations_run"]
+        genetic.start_generation = state["start_generation"]
+        return genetic
+
+    def checkpoint_state(self, generation, run_options):
+        """ Everything needed to continue the run, handed to a checkpoint.
+
+        :param generation: Number of generations finished in this run
+        :type generation: int
+        :param run_options: Keyword arguments run was called with
+        :type run_options: dict
+        :return: Parameters, population, best chromosome, counters and random
+        generator of the run
+        :rtype: dict
+        """
+        state = dict(
+            run_options,
+            engine="ga",
+            chromosome_size=self.chromosome_size,
+            population_size=self.population_size,
+            generation_count=self.generation_count,
+            genotypes=self.current_generation.genotypes,
+            fitness=self.current_generation.fitness,
+            best_genotype=np.array(
+                self.best_chromosome.genotype, dtype=np.uint8
+            ),
+            best_fitness=self.best_chromosome.fitness,
+            generation_max_fitness=np.array(self.generation_max_fitness),
+            generation_average_fitness=np.array(
+                self.generation_average_fitness
+            ),
+            evaluation_count=self.evaluation_count,
+            generations_run=self.generations_run,
+            start_generation=generation,
+            rng=self.rng
+        )
+        if self.fitness_cache_size is not None:
+            state["fitness_cache_size"] = self.fitness_cache_size
+        return state
+
+    def initialize_population(self, genotypes=None, fitness=None):
+        """ Initialize the first population, random unless genotypes are
+        given.
+
+        :param genotypes: Bit matrix of the population, defaults to None
+        :type genotypes: numpy.ndarray, optional
+        :param fitness: Already known fitness of each row, defaults to None
+        :type fitness: numpy.ndarray, optional
+        :return: First population
+        :rtype: Population
+        """
+        if genotypes is not None:
+            return Population(
+                genotypes, fitness=fitness, fitness_cache=self.fitness_cache,
+                evaluator=self.evaluator, rng=self.rng
+            )
+        return Population.random(
+            self.population_size, self.chromosome_size,
+            fitness_cache=self.fitness_cache, evaluator=self.evaluator,
+            rng=self.rng
+        )
+
+    @property
+    def fitness_cache_hits(self):
+        """ Number of fitness evaluations answered by the fitness cache.
+
+        :return: Cache hits so far
+        :rtype: int
+        """
+        return 0 if self.fitness_cache is None else self.fitness_cache.hits
+
+    @property
+    def fitness_cache_misses(self):
+        """ Number of genotypes looked up in the fitness cache and evaluated.
 
-        :return: List of random chromosome
-        :rtype: list
+        :return: Cache misses so far
+        :rtype: int
         """
-        return [
-            Chromosome.random(self.chromosome_size)
-            for _ in range(self.population_size)
-        ]
+        return 0 if self.fitness_cache is None else self.fitness_cache.misses
 
     def run(
             self, crossover_method="3_point",
             parent_selection_method="rws",
             survival_selection_method="rws",
             mutation_selection_probability=1.0,
-            mutation_gene_probability=0.1
+            mutation_gene_probability=0.1,
+            mutation_method="per_gene",
+            stopping=None,
+            checkpoint=None
     ):
         """ Run genetic algorithm for ackley function in given methods.
 
@@ -60,7 +214,8 @@ class Genetic:
         defaults to "3_point"
         :type crossover_method: str, optional
         :param parent_selection_method: Parent selection method, could be "rws"
-        (Roulette Wheal Selection), "sus" (Stochastic Universal Sampling),
+        (Roulette Wheal Selection), "rws_alias" (Roulette Wheal Selection
+        drawn from an alias table), "sus" (Stochastic Universal Sampling),
         "ts_n" (Tournament Selection with size n) or "rb" (Rank-based Selection
         ), defaults to "rws"
         :type parent_selection_method: str, optional
@@ -75,66 +230,147 @@ class Genetic:
         :param mutation_gene_probability: Probability of changing a gene in
         mutation, defaults to 0.1
         :type mutation_gene_probability: float, optional
+        :param mutation_method: How mutated genes are drawn, "per_gene" (a
+        random number for every gene) or "geometric" (geometric gaps between
+        flipped genes, cost follows the number of flips), defaults to
+        "per_gene"
+        :type mutation_method: str, optional
+        :param stopping: Stopping criterion checked before every generation,
+        any object with start() and check(state) such as the ones in
+        stopping.py, the run ends early when check returns a description,
+        which is stored in stopped_by, defaults to None (run all
+        generation_count generations)
+        :type stopping: StoppingCriterion, optional
+        :param checkpoint: Saver of the run state, any object with start(),
+        due(generation) and save(state) such as Checkpoint in checkpoint.py,
+        save receives checkpoint_state at the end of every generation where
+        due returns True, defaults to None (no checkpoints)
+        :type checkpoint: Checkpoint, optional
         """
-        for _ in range(self.generation_count):
+        run_options = {
+            "crossover_method": crossover_method,
+            "parent_selection_method": parent_selection_method,
+            "survival_selection_method": survival_selection_method,
+            "mutation_selection_probability": mutation_selection_probability,
+            "mutation_gene_probability": mutation_gene_probability,
+            "mutation_method": mutation_method,
+        }
+        self.stopped_by = "generation count"
+        if stopping is not None:
+            stopping.start()
+        if checkpoint is not None:
+            checkpoint.start()
+        start_generation, self.start_generation = self.start_generation, 0
+        for generation in range(start_generation, self.generation_count):
             self.generation_max_fitness.append(
-                max(self.current_generation, key=lambda c: c.fitness).fitness
+                float(np.max(self.current_generation.fitness))
             )
             self.generation_average_fitness.append(
-                Genetic.fitness_sum(self.current_generation)
+                Genetic.fitness_sum(self.current_generation.fitness)
                 / self.population_size
             )
-            selected_parent_list = self.parent_selection(
-                parent_selection_method
+            if stopping is not None:
+                fired = stopping.check(self.get_state(generation))
+                if fired:
+                    self.stopped_by = fired
+                    break
+            selected_parents = self.current_generation.take(
+                self.parent_selection(parent_selection_method)
+            )
+            first_parents = selected_parents.take(slice(0, None, 2))
+            second_parents = selected_parents.take(slice(1, None, 2))
+            first_children, second_children = first_parents.crossover(
+                second_parents,
+                crossover_method
+            )
+            first_children.mutation(
+                mutation_selection_probability,
+                mutation_gene_probability,
+                mutation_method
+            )
+            second_children.mutation(
+                mutation_selection_probability,
+                mutation_gene_probability,
+                mutation_method
+            )
+            family_list = [
+                first_children, second_children, first_parents, second_parents
+            ]
+            family_genotypes = np.stack(
+                [family.genotypes for family in family_list], axis=1
+            )
+            family_fitness = np.stack(
+                [family.fitness for family in family_list], axis=1
+            )
+            survivors = Genetic.survival_selection(
+                family_fitness,
+                survival_selection_method,
+                self.rng
+            )
+            rows = np.arange(len(survivors))[:, np.newaxis]
+            self.next_generation = Population(
+                family_genotypes[rows, survivors].reshape(
+                    -1, self.current_generation.chromosome_size
+                ),
+                self.current_generation.minimum,
+                self.current_generation.maximum,
+                family_fitness[rows, survivors].reshape(-1),
+                self.fitness_cache, self.evaluator, self.rng,
+                self.current_generation.base
             )
-            for i in range(0, len(selected_parent_list), 2):
-                offspring_list = []
-                offspring_list.extend(
-                    selected_parent_list[i].crossover(
-                        selected_parent_list[i+1],
-                        crossover_method
-                    )
-                )
-                offspring_list[0].mutation(
-                    mutation_selection_probability,
-                    mutation_gene_probability
-                )
-                offspring_list[1].mutation(
-                    mutation_selection_probability,
-                    mutation_gene_probability
-                )
-                self.next_generation.extend(
-                    self.survival_selection(
-                        offspring_list + [
-                            selected_parent_list[i],
-                            selected_parent_list[i+1]
-                        ],
-                        survival_selection_method
-                    )
-                )
             self.go_to_the_future()
+            self.generations_run += 1
+            self.evaluation_count += self.population_size
             self.best_chromosome = max(
                 self.best_chromosome,
                 Genetic.find_best_chromosome(self.current_generation),
                 key=lambda c: c.fitness
             )
+            if checkpoint is not None and checkpoint.due(generation + 1):
+                checkpoint.save(
+                    self.checkpoint_state(generation + 1, run_options)
+                )
         self.best_chromosome_last_generation = Genetic.find_best_chromosome(
             self.current_generation
         )
 
+    def get_state(self, generation):
+        """ State of the run handed to stopping criteria.
+
+        :param generation: Number of generations finished in this run
+        :type generation: int
+        :return: Generation, evaluation count, best fitness so far, current
+        genotypes and their fitness
+        :rtype: dict
+        """
+        return {
+            "generation": generation,
+            "evaluations": self.evaluation_count,
+            "best_fitness": self.best_chromosome.fitness,
+            "population": self.current_generation.genotypes,
+            "fitness": self.current_generation.fitness,
+            "minimize": False,
+        }
+
     def parent_selection(self, parent_selection_method):
         """ Parent selection based on selection method.
 
-        :param parent_selection_method: Parent selection method (rws, sus, ts,
-        rb)
+        :param parent_selection_method: Parent selection method (rws,
+        rws_alias, sus, ts, rb)
         :type parent_selection_method: str
-        :return: List of chromosomes, to be the parents of the next generation
-        :rtype: list
+        :return: Indices of chromosomes in current generation, to be the
+        parents of the next generation
+        :rtype: numpy.ndarray
         """
+        if parent_selection_method == "rws_alias":
+            if self.alias_table is None:
+                self.alias_table = AliasTable(self.current_generation.fitness)
+            return self.alias_table.sample(self.population_size, self.rng)
         return Genetic.selection(
-            self.current_generation,
+            self.current_generation.fitness,
             self.population_size,
-            parent_selection_method
+            parent_selection_method,
+            self.rng
         )
 
     def go_to_the_future(self):
@@ -144,161 +380,243 @@ class Genetic:
         :rtype: NoneType
         """
         self.current_generation = self.next_generation
-        self.next_generation = list()
+        self.next_generation = None
+        self.alias_table = None
 
     @staticmethod
-    def survival_selection(chromosome_list, survival_selection_method):
-        """ Survival selection based on selection method.
+    def survival_selection(
+            family_fitness, survival_selection_method, rng=None
+    ):
+        """ Survival selection based on selection method, two survivors are
+        chosen from each family (two children and their two parents).
 
-        :param chromosome_list: Chromosome list to select from
-        :type chromosome_list: list
+        :param family_fitness: Fitness matrix with one family in each row
+        :type family_fitness: numpy.ndarray
         :param survival_selection_method: Survival selection method (rws, sus,
         ts, rb)
         :type survival_selection_method: str
-        :return: List of chromosomes, to be the survivals of the next
-        generation
-        :rtype: list
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :return: Matrix of survivor indices within each family, to be the
+        survivals of the next generation
+        :rtype: numpy.ndarray
         """
         return Genetic.selection(
-            chromosome_list,
+            family_fitness,
             2,
-            survival_selection_method
+            survival_selection_method,
+            rng
         )
 
     @staticmethod
-    def selection(chromosome_list, size, selection_method):
-        """ Select chromosomes based on selection method.
+    def selection(fitness, size, selection_method, rng=None):
+        """ Select chromosomes based on selection method. A fitness matrix
+        is treated as independent groups, and ``size`` chromosomes are
+        selected from each row.
 
-        :param chromosome_list: Chromosome list to select from
-        :type chromosome_list: list
+        :param fitness: Fitness of the chromosomes to select from, a vector
+        or a matrix with one group in each row
+        :type fitness: numpy.ndarray
         :param size: Size of chromosomes that should be selected
         :type size: int
-        :param selection_method: Selection method (rws, sus, ts, rb, elitism)
+        :param selection_method: Selection method (rws, rws_alias, sus, ts,
+        rb, elitism)
         :type selection_method: str
-        :return: List of selected chromosomes
-        :rtype: list
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :return: Indices of selected chromosomes, with the same number of
+        dimensions as fitness
+        :rtype: numpy.ndarray
         """
+        rng = np.random.default_rng(rng)
+        fitness = np.asarray(fitness, dtype=float)
+        if fitness.ndim == 1:
+            selected = Genetic.selection(
+                fitness[np.newaxis], size, selection_method, rng
+            )
+            return selected if selected is False else selected[0]
         if selection_method == "rws":
-            return [
-                Genetic.roulette_wheal_selection(chromosome_list)
-                for _ in range(size)
-            ]
+            return Genetic.roulette_wheal_selection(fitness, size, rng)
+        if selection_method == "rws_alias":
+            return np.array([
+                AliasTable(row).sample(size, rng) for row in fitness
+            ], dtype=np.intp)
         if selection_method == "rb":
-            return [
-                Genetic.rank_based_selection(chromosome_list)
-                for _ in range(size)
-            ]
+            return Genetic.rank_based_selection(fitness, size, rng)
         if selection_method[0:2] == "ts":
-            return [
-                Genetic.tournament_selection(
-                    chromosome_list,
-                    int(selection_method.split('_')[1])
-                )
-                for _ in range(size)
-            ]
+            return Genetic.tournament_selection(
+                fitness,
+                size,
+                int(selection_method.split('_')[1]),
+                rng
+            )
         if selection_method == "sus":
-            return Genetic.stochastic_universal_sampling(chromosome_list, size)
+            return Genetic.stochastic_universal_sampling(fitness, size, rng)
         if selection_method == "elitism":
-            chromosome_list.sort(reverse=True, key=lambda c: c.fitness)
-            return [
-                chromosome_list[i] for i in range(size)
-            ]
+            return np.argsort(-fitness, axis=1, kind="stable")[:, :size]
         return False
 
     @staticmethod
-    def fitness_sum(chromosome_list):
-        """ Add up all the chromosomes fitness in current generation.
+    def fitness_sum(fitness):
+        """ Add up all the chromosomes fitness.
 
-        :return: Sum of all chromosomes fitness in current generation
+        :param fitness: Fitness of the chromosomes
+        :type fitness: numpy.ndarray
+        :return: Sum of all chromosomes fitness
         :rtype: float
         """
-        summation = 0
-        for chromosome in chromosome_list:
-            summation += chromosome.fitness
-        return summation
+        return float(np.sum(fitness))
 
     @staticmethod
-    def rank_based_selection(chromosome_list):
-        """ Select a chromosome based on rank selection (rb)
+    def build_selection_index(weights):
+        """ Build a cumulative index over selection weights, once for all the
+        draws of a generation. Prefix sums of each row are normalized to
+        [0, 1] and shifted by the row number, so every group can be searched
+        in a single flat array.
 
-        :param chromosome_list: List of chromosome
-        :type chromosome_list: list
-        :return: Selected chromosome based on rank selection
-        :rtype: Chromosome
+        :param weights: Weight matrix with one group in each row
+        :type weights: numpy.ndarray
+        :return: Flat, strictly grouped cumulative index
+        :rtype: numpy.ndarray
         """
-        chromosome_list.sort(key=lambda c: c.fitness)
-        rank_sum = ((1 + len(chromosome_list)) * len(chromosome_list)) / 2
-        random_float = random.uniform(0, rank_sum)
-        for i, chromosome in enumerate(chromosome_list):
-            random_float -= i + 1
-            if random_float <= 0:
-                return chromosome
-        return chromosome_list[-1]
+        cumulative = np.cumsum(weights, axis=1, dtype=float)
+        cumulative /= cumulative[:, -1:]
+        cumulative += np.arange(len(cumulative))[:, np.newaxis]
+        return cumulative.ravel()
 
     @staticmethod
-    def roulette_wheal_selection(chromosome_list):
-        """ Select a chromosome based on roulette wheal selection (rws)
+    def search_selection_index(selection_index, candidate_count, draws):
+        """ Resolve weighted draws from every group of a selection index with
+        one binary search call.
 
-        :param chromosome_list: List of chromosome
-        :type chromosome_list: list
-        :return: Selected chromosome based on roulette wheal selection
-        :rtype: Chromosome
+        :param selection_index: Index built by build_selection_index
+        :type selection_index: numpy.ndarray
+        :param candidate_count: Number of candidates in each group
+        :type candidate_count: int
+        :param draws: Matrix of draws in [0, 1), one row for each group
+        :type draws: numpy.ndarray
+        :return: Matrix of selected indices within each group
+        :rtype: numpy.ndarray
+        """
+        offsets = np.arange(len(draws))[:, np.newaxis]
+        positions = (
+            np.searchsorted(selection_index, draws + offsets)
+            - offsets * candidate_count
+        )
+        return np.clip(positions, 0, candidate_count - 1)
+
+    @staticmethod
+    def rank_based_selection(fitness, size, rng=None):
+        """ Select chromosomes based on rank selection (rb), the worst
+        chromosome of each group has weight 1 and the best has the group size.
+
+        :param fitness: Fitness matrix with one group in each row
+        :type fitness: numpy.ndarray
+        :param size: Number of chromosomes selected from each group
+        :type size: int
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :return: Matrix of selected indices based on rank selection
+        :rtype: numpy.ndarray
         """
-        fitness_sum = Genetic.fitness_sum(chromosome_list)
-        random_float = random.uniform(0, fitness_sum)
-        for chromosome in chromosome_list:
-            random_float -= chromosome.fitness
-            if random_float <= 0:
-                return chromosome
-        return chromosome_list[-1]
+        rng = np.random.default_rng(rng)
+        ranks = np.argsort(
+            np.argsort(fitness, axis=1, kind="stable"), axis=1
+        ) + 1
+        return Genetic.search_selection_index(
+            Genetic.build_selection_index(ranks),
+            fitness.shape[1],
+            rng.random((len(fitness), size))
+        )
 
     @staticmethod
-    def tournament_selection(chromosome_list, size):
-        """ Select a chromosome based on tournament selection (ts_n)
+    def roulette_wheal_selection(fitness, size, rng=None):
+        """ Select chromosomes based on roulette wheal selection (rws)
 
-        :param chromosome_list: List of chromosome
-        :type chromosome_list: list
-        :param size: Size of tournament
+        :param fitness: Fitness matrix with one group in each row
+        :type fitness: numpy.ndarray
+        :param size: Number of chromosomes selected from each group
         :type size: int
-        :return: Selected chromosome based on tournament selection
-        :rtype: Chromosome
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :return: Matrix of selected indices based on roulette wheal selection
+        :rtype: numpy.ndarray
+        """
+        rng = np.random.default_rng(rng)
+        return Genetic.search_selection_index(
+            Genetic.build_selection_index(fitness),
+            fitness.shape[1],
+            rng.random((len(fitness), size))
+        )
+
+    @staticmethod
+    def tournament_selection(fitness, size, tournament_size, rng=None):
+        """ Select chromosomes based on tournament selection (ts_n), all the
+        tournaments of every group are drawn and decided at once.
+
+        :param fitness: Fitness matrix with one group in each row
+        :type fitness: numpy.ndarray
+        :param size: Number of chromosomes selected from each group
+        :type size: int
+        :param tournament_size: Size of tournament
+        :type tournament_size: int
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :return: Matrix of selected indices based on tournament selection
+        :rtype: numpy.ndarray
         """
-        tournament = random.sample(chromosome_list, k=size)
-        return max(tournament, key=lambda c: c.fitness)
+        tournaments = sample_without_replacement(
+            fitness.shape[1], (len(fitness), size), tournament_size,
+            np.random.default_rng(rng)
+        )
+        rows = np.arange(len(fitness))[:, np.newaxis, np.newaxis]
+        winners = np.argmax(fitness[rows, tournaments], axis=2)
+        return np.take_along_axis(
+            tournaments, winners[..., np.newaxis], axis=2
+        )[..., 0]
 
     @staticmethod
-    def stochastic_universal_sampling(chromosome_list, size):
-        """ Select a list of chromosome based on stochastic universal sampling
-        (sus)
+    def stochastic_universal_sampling(fitness, size, rng=None):
+        """ Select chromosomes based on stochastic universal sampling (sus).
+        All ``size`` equally spaced pointers of a group share one random
+        offset and are resolved against the cumulative fitness in a single
+        sweep, then the selection of each group is shuffled.
 
-        :param chromosome_list: List of chromosome
-        :type chromosome_list: list
-        :param size: Size of chromosome list to be selected
+        :param fitness: Fitness matrix with one group in each row
+        :type fitness: numpy.ndarray
+        :param size: Number of chromosomes selected from each group
         :type size: int
-        :return: Selected chromosome based on stochastic universal sampling
-        :rtype: Chromosome
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :return: Matrix of selected indices based on stochastic universal
+        sampling
+        :rtype: numpy.ndarray
         """
-        fitness_sum = Genetic.fitness_sum(chromosome_list)
-        random_float = random.uniform(0, fitness_sum)
-        distance = fitness_sum / size
-        selected_chromosome_list = list()
-        while True:
-            for chromosome in chromosome_list:
-                random_float -= chromosome.fitness
-                if random_float <= 0:
-                    selected_chromosome_list.append(chromosome)
-                    if len(selected_chromosome_list) == size:
-                        return selected_chromosome_list
-                    random_float = distance + random_float
-        return random.shuffle(selected_chromosome_list)
+        rng = np.random.default_rng(rng)
+        pointers = (
+            rng.random((len(fitness), 1)) + np.arange(size)
+        ) / size
+        selected = Genetic.search_selection_index(
+            Genetic.build_selection_index(fitness),
+            fitness.shape[1],
+            pointers
+        )
+        order = np.argsort(rng.random(selected.shape), axis=1)
+        return np.take_along_axis(selected, order, axis=1)
 
     @staticmethod
-    def find_best_chromosome(chromosome_list):
-        """ Find best chromosome from a chromosome list.
+    def find_best_chromosome(population):
+        """ Find best chromosome from a population.
 
-        :param chromosome_list: List of chromosome
-        :type chromosome_list: list
-        :return: Best chromosome from chromosome_list
+        :param population: Population of chromosomes
+        :type population: Population
+        :return: Best chromosome from population
         :rtype: Chromosome
         """
-        return max(chromosome_list, key=lambda c: c.fitness)
+        return population.chromosome(population.best_index())
@@ -0,0 +1,225 @@
+"""
+Compact binary chromosome that packs the whole genotype into one Python int,
+gene i being bit i. Crossover is a mask-and-or of the two parents and
+mutation is an XOR with a random mask, so both work on machine words instead
+of one list item per gene.
+"""
+
+import numpy as np
+
+from chromosome import Chromosome, get_geometric_positions
+
+
+def get_random_bits(size, rng=None):
+    """ Random integer of size bits, each bit being 1 with probability 0.5.
+
+    :param size: Number of bits
+    :type size: int
+    :param rng: Random generator (or seed), defaults to None (a fresh
+    unseeded generator)
+    :type rng: numpy.random.Generator, optional
+    :return: Random bits
+    :rtype: int
+    """
+    rng = np.random.default_rng(rng)
+    value = int.from_bytes(rng.bytes((size + 7) // 8), "little")
+    return value & ((1 << size) - 1)
+
+
+class PackedChromosome(Chromosome):
+    """ Chromosome with its genotype stored as a bit-packed integer.
+
+    """
+    def __init__(self, genotype, size, minimum=-5, maximum=5):
+        self.size = size
+        self.minimum = minimum
+        self.maximum = maximum
+        self.genotype = genotype
+        self._fitness = None
+
+    @classmethod
+    def random(cls, size, minimum=-5, maximum=5, rng=None):
+        """ Create a random chromosome instance.
+
+        :param size: Size of chromosome
+        :type size: int
+        :param minimum: Minimum value in phenotype, defaults to -5
+        :type minimum: int, optional
+        :param maximum: Maximum value in phenotype, defaults to 5
+        :type maximum: int, optional
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :return: An instance of packed chromosome class
+        :rtype: PackedChromosome
+        """
+        if size % 2 == 1:
+            print("size can't be odd, increasing by 1 automatically")
+            size += 1
+        return cls(get_random_bits(size, rng), size, minimum, maximum)
+
+    @classmethod
+    def from_gen_list(cls, gen_list, minimum=-5, maximum=5):
+        """ Create a chromosome based on a gen_list.
+
+        :param gen_list: A list which the chromosome should be created from
+        :type gen_list: list
+        :param minimum: Minimum value in phenotype, defaults to -5
+        :type minimum: int, optional
+        :param maximum: Maximum value in phenotype, defaults to 5
+        :type maximum: int, optional
+        :return: An instance of packed chromosome class
+        :rtype: PackedChromosome
+        """
+        genotype = 0
+        for i, gen in enumerate(gen_list):
+            if int(gen):
+                genotype |= 1 << i
+        return cls(genotype, len(gen_list), minimum, maximum)
+
+    def __str__(self):
+        return format(self.genotype, f"0{self.size}b")[::-1]
+
+    def __repr__(self):
+        return format(self.genotype, f"0{self.size}b")[::-1]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [(self.genotype >> i) & 1 for i in range(self.size)[key]]
+        if key < 0:
+            key += self.size
+        if not 0 <= key < self.size:
+            raise IndexError("chromosome index out of range")
+        return (self.genotype >> key) & 1
+
+    def __setitem__(self, key, value):
+        if key < 0:
+            key += self.size
+        if int(value):
+            genotype = self.genotype | (1 << key)
+        else:
+            genotype = self.genotype & ~(1 << key)
+        if genotype != self.genotype:
+            self.genotype = genotype
+            self._fitness = None
+
+    def packed_genotype(self):
+        """ Pack the genotype into bytes, gene i being bit i, used as a
+        compact fitness cache key.
+
+        :return: Packed genotype
+        :rtype: bytes
+        """
+        return self.genotype.to_bytes((self.size + 7) // 8, "little")
+
+    def __get_half_value(self, start, length):
+        raw_value = (self.genotype >> start) & ((1 << length) - 1)
+        return (
+            raw_value *
+            ((self.maximum - self.minimum) / ((2 ** length) - 1))
+            + self.minimum
+        )
+
+    def __children_from_mask(self, second_parent, mask):
+        """ Exchange the genes selected by mask between the two parents.
+
+        :param second_parent: Second parent
+        :type second_parent: PackedChromosome
+        :param mask: Bits taken from the other parent
+        :type mask: int
+        :return: A tuple containing two children
+        :rtype: tuple
+        """
+        difference = (self.genotype ^ second_parent.genotype) & mask
+        return (
+            PackedChromosome(
+                self.genotype ^ difference, self.size,
+                self.minimum, self.maximum
+            ),
+            PackedChromosome(
+                second_parent.genotype ^ difference, self.size,
+                self.minimum, self.maximum
+            )
+        )
+
+    def general_crossover(self, second_parent, split_point_list):
+        """ Crossover with two parent chromosome and produce two children.
+
+        :param second_parent: Second parent
+        :type second_parent: PackedChromosome
+        :param split_point_list: A list with random split points
+        :type split_point_list: list
+        :return: A tuple containing two children
+        :rtype: tuple
+        """
+        mask = 0
+        for start, end in zip(split_point_list[1::2], split_point_list[2::2]):
+            mask |= ((1 << end) - 1) ^ ((1 << start) - 1)
+        return self.__children_from_mask(second_parent, mask)
+
+    def uniform_crossover(self, second_parent, rng=None):
+        """ Uniform crossover, each bit is chosen from either parent.
+
+        :param second_parent: Second parent
+        :type second_parent: PackedChromosome
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :return: A tuple containing two children
+        :rtype: tuple
+        """
+        return self.__children_from_mask(
+            second_parent, get_random_bits(self.size, rng)
+        )
+
+    def mutation(
+            self, selection_probability, gene_probability, method="per_gene",
+            rng=None
+    ):
+        """ Perform mutation on chromosome
+
+        :param selection_probability: Probability of selecting a chromosome
+        :type selection_probability: float
+        :param gene_probability: Probability of changing each gene
+        :type gene_probability: float
+        :param method: "per_gene" draws a random number for every gene,
+        "geometric" jumps straight to the flipped genes, defaults to
+        "per_gene"
+        :type method: str, optional
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        """
+        rng = np.random.default_rng(rng)
+        if rng.random() > selection_probability:
+            return
+        flips = 0
+        if method == "geometric":
+            for i in get_geometric_positions(
+                    self.size, gene_probability, rng
+            ).tolist():
+                flips |= 1 << i
+        else:
+            flips = int.from_bytes(np.packbits(
+                rng.random(self.size) <= gene_probability,
+                bitorder="little"
+            ).tobytes(), "little")
+        if flips:
+            self.genotype ^= flips
+            self._fitness = None
+
+    def get_x(self):
+        """ Get value of x in phenotype space.
+
+        :return: Value of x
+        :rtype: float
+        """
+        return self.__get_half_value(0, self.size // 2)
+
+    def get_y(self):
+        """ Get value of y in phenotype space.
+
+        :return: Value of y
+        :rtype: float
+        """
+        return self.__get_half_value(self.size // 2, self.size - self.size // 2)
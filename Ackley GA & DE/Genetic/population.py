@@ -0,0 +1,366 @@
+"""
+Array-backed binary population for the genetic algorithm. A whole generation
+is stored as one (population size x chromosome size) uint8 matrix, so
+crossover, mutation, decoding and fitness run as batched array operations
+instead of one Chromosome object per individual.
+"""
+
+from functools import partial
+
+import numpy as np
+
+from chromosome import Chromosome, get_geometric_positions
+
+
+class Population():
+    """ A generation of binary chromosomes stored as a single bit matrix.
+
+    """
+    def __init__(
+            self, genotypes, minimum=-5, maximum=5, fitness=None,
+            fitness_cache=None, evaluator=None, rng=None, base=21
+    ):
+        """ Initialize an instance of population class.
+
+        :param genotypes: Bit matrix, one row per chromosome
+        :type genotypes: numpy.ndarray
+        :param minimum: Minimum value in phenotype, defaults to -5
+        :type minimum: int, optional
+        :param maximum: Maximum value in phenotype, defaults to 5
+        :type maximum: int, optional
+        :param fitness: Already known fitness of each row, NaN marks a row
+        that still has to be calculated, defaults to None (no row known)
+        :type fitness: numpy.ndarray, optional
+        :param fitness_cache: Cache consulted before evaluating a row,
+        defaults to None
+        :type fitness_cache: FitnessCache, optional
+        :param evaluator: Evaluator the stale rows are sent to in one batch,
+        any object with evaluate(function, candidates, vectorized) such as
+        the ones in evaluator.py, defaults to None (evaluate in this thread)
+        :type evaluator: PoolEvaluator, optional
+        :param rng: Random generator (or seed) of crossover and mutation,
+        defaults to None (a fresh unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :param base: Base of our fitness calculation, part of the fitness
+        cache key, defaults to 21
+        :type base: int, optional
+        """
+        self.genotypes = np.ascontiguousarray(genotypes, dtype=np.uint8)
+        self.size, self.chromosome_size = self.genotypes.shape
+        self.minimum = minimum
+        self.maximum = maximum
+        self.base = base
+        self.fitness_cache = fitness_cache
+        self.evaluator = evaluator
+        self.rng = np.random.default_rng(rng)
+        if fitness is None:
+            self._fitness = np.full(self.size, np.nan)
+        else:
+            self._fitness = np.array(fitness, dtype=float)
+
+    @classmethod
+    def random(
+            cls, population_size, chromosome_size, minimum=-5, maximum=5,
+            fitness_cache=None, evaluator=None, rng=None, base=21
+    ):
+        """ Create a random population instance.
+
+        :param population_size: Number of chromosomes
+        :type population_size: int
+        :param chromosome_size: Size of each chromosome
+        :type chromosome_size: int
+        :param minimum: Minimum value in phenotype, defaults to -5
+        :type minimum: int, optional
+        :param maximum: Maximum value in phenotype, defaults to 5
+        :type maximum: int, optional
+        :param fitness_cache: Cache consulted before evaluating a row,
+        defaults to None
+        :type fitness_cache: FitnessCache, optional
+        :param evaluator: Evaluator the stale rows are sent to in one batch,
+        any object with evaluate(function, candidates, vectorized) such as
+        the ones in evaluator.py, defaults to None (evaluate in this thread)
+        :type evaluator: PoolEvaluator, optional
+        :param rng: Random generator (or seed) of crossover and mutation,
+        defaults to None (a fresh unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :param base: Base of our fitness calculation, defaults to 21
+        :type base: int, optional
+        :return: An instance of population class
+        :rtype: Population
+        """
+        if chromosome_size % 2 == 1:
+            print("size can't be odd, increasing by 1 automatically")
+            chromosome_size += 1
+        rng = np.random.default_rng(rng)
+        genotypes = rng.integers(
+            0, 2, size=(population_size, chromosome_size), dtype=np.uint8
+        )
+        return cls(
+            genotypes, minimum, maximum, fitness_cache=fitness_cache,
+            evaluator=evaluator, rng=rng, base=base
+        )
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def fitness(self):
+        """ Fitness of every chromosome. Rows are calculated in one batch on
+        first access and cached until mutation changes them, so each
+        chromosome is evaluated once.
+
+        :return: Fitness of each row
+        :rtype: numpy.ndarray
+        """
+        stale = np.flatnonzero(np.isnan(self._fitness))
+        if len(stale) == 0:
+            return self._fitness
+        if self.fitness_cache is None:
+            self._fitness[stale] = self.__evaluate(stale)
+            return self._fitness
+        packed = np.packbits(
+            self.genotypes[stale].astype(bool), axis=1, bitorder="little"
+        )
+        key_list = [
+            (self.minimum, self.maximum, self.base, self.chromosome_size,
+             row.tobytes())
+            for row in packed
+        ]
+        missing = []
+        for index, key in zip(stale, key_list):
+            fitness = self.fitness_cache.get(key)
+            if fitness is None:
+                missing.append(index)
+            else:
+                self._fitness[index] = fitness
+        if missing:
+            self._fitness[missing] = self.__evaluate(missing)
+            for index, key in zip(stale, key_list):
+                if key not in self.fitness_cache:
+                    self.fitness_cache.put(key, float(self._fitness[index]))
+        return self._fitness
+
+    def __evaluate(self, indices):
+        """ Calculate fitness of the given rows, on the evaluator if set.
+
+        :param indices: Row indices
+        :type indices: numpy.ndarray or list
+        :return: Fitness of each row
+        :rtype: numpy.ndarray
+        """
+        genotypes = self.genotypes[indices]
+        if self.evaluator is None:
+            return Chromosome.evaluate_batch(
+                genotypes, self.minimum, self.maximum, self.base
+            )
+        return self.evaluator.evaluate(
+            partial(
+                Chromosome.evaluate_batch,
+                minimum=self.minimum, maximum=self.maximum, base=self.base
+            ),
+            genotypes, vectorized=True
+        )
+
+    def take(self, indices):
+        """ Create a population from the chosen rows, reusing their fitness
+        (or lack of it).
+
+        :param indices: Row indices (or a slice) to take
+        :type indices: numpy.ndarray or slice
+        :return: A new population holding copies of the chosen rows
+        :rtype: Population
+        """
+        return Population(
+            self.genotypes[indices], self.minimum, self.maximum,
+            self._fitness[indices], self.fitness_cache, self.evaluator,
+            self.rng, self.base
+        )
+
+    def chromosome(self, index):
+        """ Build a Chromosome object from one row of the population.
+
+        :param index: Row index
+        :type index: int
+        :return: Chromosome with the same genotype
+        :rtype: Chromosome
+        """
+        chromosome = Chromosome.from_gen_list(
+            self.genotypes[index].tolist(), self.minimum, self.maximum
+        )
+        chromosome._fitness = float(self.fitness[index])
+        return chromosome
+
+    def best_index(self):
+        """ Find index of the best chromosome.
+
+        :return: Row index with the highest fitness
+        :rtype: int
+        """
+        return int(np.argmax(self.fitness))
+
+    def calculate_phenotype_values(self):
+        """ Decode x and y of every chromosome in one pass.
+
+        :return: A tuple of x and y arrays
+        :rtype: tuple
+        """
+        return Chromosome.decode_batch(
+            self.genotypes, self.minimum, self.maximum
+        )
+
+    def calculate_ackley_function(self):
+        """ Calculate ackley function for every chromosome.
+
+        :return: Ackley function output of each row
+        :rtype: numpy.ndarray
+        """
+        return Chromosome.ackley_function(*self.calculate_phenotype_values())
+
+    def calculate_fitness(self, base=None):
+        """ Calculate fitness of every chromosome, see
+        Chromosome.calculate_fitness.
+
+        :param base: Base of our fitness calculation, defaults to None (the
+        base of the population)
+        :type base: int, optional
+        :return: Fitness of each row
+        :rtype: numpy.ndarray
+        """
+        if base is None:
+            base = self.base
+        return Chromosome.evaluate_batch(
+            self.genotypes, self.minimum, self.maximum, base
+        )
+
+    def __get_random_split_mask(self, count):
+        """ Build a mask that is True on every odd segment between ``count``
+        random unique split points, independently for each row.
+
+        :param count: Number of split points needed
+        :type count: int
+        :return: Boolean matrix with the population shape
+        :rtype: numpy.ndarray
+        """
+        split_points = np.argpartition(
+            self.rng.random((self.size, self.chromosome_size - 1)),
+            count - 1, axis=1
+        )[:, :count] + 1
+        toggles = np.zeros((self.size, self.chromosome_size), dtype=np.uint8)
+        np.put_along_axis(toggles, split_points, 1, axis=1)
+        return np.cumsum(toggles, axis=1) % 2 == 1
+
+    def general_crossover(self, second_parents, mask):
+        """ Crossover row by row with a second population, children take
+        genes from the other parent where mask is True.
+
+        :param second_parents: Second parents, same shape as this population
+        :type second_parents: Population
+        :param mask: Boolean matrix with the population shape
+        :type mask: numpy.ndarray
+        :return: A tuple containing two populations of children
+        :rtype: tuple
+        """
+        first_genotypes = self.genotypes
+        second_genotypes = second_parents.genotypes
+        return (
+            Population(
+                np.where(mask, second_genotypes, first_genotypes),
+                self.minimum, self.maximum,
+                fitness_cache=self.fitness_cache, evaluator=self.evaluator,
+                rng=self.rng, base=self.base
+            ),
+            Population(
+                np.where(mask, first_genotypes, second_genotypes),
+                self.minimum, self.maximum,
+                fitness_cache=self.fitness_cache, evaluator=self.evaluator,
+                rng=self.rng, base=self.base
+            )
+        )
+
+    def single_point_crossover(self, second_parents):
+        """ Single point crossover.
+
+        :param second_parents: Second parents
+        :type second_parents: Population
+        :return: A tuple containing two populations of children
+        :rtype: tuple
+        """
+        mask = self.__get_random_split_mask(1)
+        return self.general_crossover(second_parents, mask)
+
+    def n_point_crossover(self, second_parents, count):
+        """ N-Point crossover.
+
+        :param second_parents: Second parents
+        :type second_parents: Population
+        :param count: Number of split points
+        :type count: int
+        :return: A tuple containing two populations of children
+        :rtype: tuple
+        """
+        mask = self.__get_random_split_mask(count)
+        return self.general_crossover(second_parents, mask)
+
+    def uniform_crossover(self, second_parents):
+        """ Uniform crossover, each bit is chosen from either parent.
+
+        :param second_parents: Second parents
+        :type second_parents: Population
+        :return: A tuple containing two populations of children
+        :rtype: tuple
+        """
+        mask = self.rng.integers(
+            0, 2, size=self.genotypes.shape, dtype=np.uint8
+        ).astype(bool)
+        return self.general_crossover(second_parents, mask)
+
+    def crossover(self, second_parents, method):
+        """ Crossover with chosen method (n_point, single_point, uniform).
+
+        :param second_parents: Second parents
+        :type second_parents: Population
+        :param method: Method for crossover
+        :type method: str
+        """
+        if method == "uniform":
+            return self.uniform_crossover(second_parents)
+        if method.split('_')[0] == "single":
+            return self.single_point_crossover(second_parents)
+        if method.split('_')[0].isnumeric():
+            return self.n_point_crossover(
+                second_parents, int(method.split('_')[0])
+            )
+        return False
+
+    def mutation(
+            self, selection_probability, gene_probability, method="per_gene"
+    ):
+        """ Perform mutation on the whole population in place.
+
+        :param selection_probability: Probability of selecting a chromosome
+        :type selection_probability: float
+        :param gene_probability: Probability of changing each gene
+        :type gene_probability: float
+        :param method: "per_gene" draws a random number for every gene,
+        "geometric" jumps straight to the flipped genes, defaults to
+        "per_gene"
+        :type method: str, optional
+        """
+        selected = self.rng.random(self.size) <= selection_probability
+        if method == "geometric":
+            selected_rows = np.flatnonzero(selected)
+            positions = get_geometric_positions(
+                len(selected_rows) * self.chromosome_size, gene_probability,
+                self.rng
+            )
+            rows = selected_rows[positions // self.chromosome_size]
+            self.genotypes[rows, positions % self.chromosome_size] ^= 1
+            changed = np.zeros(self.size, dtype=bool)
+            changed[rows] = True
+        else:
+            flips = (
+                self.rng.random(self.genotypes.shape) <= gene_probability
+            ) & selected[:, np.newaxis]
+            changed = flips.any(axis=1)
+            self.genotypes ^= flips.view(np.uint8)
+        self._fitness[changed] = np.nan
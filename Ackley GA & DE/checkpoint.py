@@ -0,0 +1,199 @@
+"""
+Checkpoints of long genetic algorithm and differential evolution runs.
+
+A Checkpoint passed to Genetic.run or differentialEvolution.DE decides when
+the run is saved: every few generations, every few seconds, or both. Each
+save receives the population, fitness, best so far, history counters,
+parameters and random generator of the run and writes them as one .npz file,
+first to a temporary file that is then renamed over the previous checkpoint,
+so a crash while saving leaves the last complete checkpoint in place.
+
+    DE(Rastrigin, 10, bounds, 0.8, 0.7, 64, 10 ** 7, mode="generational",
+       rng=1, checkpoint=Checkpoint("run.npz", seconds=600))
+    # after a crash
+    results, all_pops, generation_count = resume("run.npz")
+
+resume continues from the generation after the checkpoint with the saved
+random stream, so the run ends exactly as it would have without the
+interruption.
+"""
+
+import importlib
+import json
+import os
+import time
+
+import numpy as np
+
+import paths  # noqa: F401
+from differentialEvolution import resume_DE
+from genetic import Genetic
+
+
+class Checkpoint():
+    """ Saves the run state every few generations or seconds.
+
+    """
+    def __init__(self, path, generations=None, seconds=None):
+        """
+        :param path: Path of the checkpoint file
+        :type path: str
+        :param generations: Generations between checkpoints, defaults to None
+        :type generations: int, optional
+        :param seconds: Seconds between checkpoints, a checkpoint is due at
+        the end of the first generation after them, defaults to None. With
+        neither interval every generation is saved
+        :type seconds: float, optional
+        """
+        self.path = path
+        self.generations = generations
+        self.seconds = seconds
+        self.last_save = None
+        self.saves = 0
+
+    def start(self):
+        """ Reset the wall clock at the beginning of a run.
+
+        :return: NoneType
+        :rtype: NoneType
+        """
+        self.last_save = time.perf_counter()
+
+    def due(self, generation):
+        """ Decide whether the state at the end of a generation is saved.
+
+        :param generation: Number of generations finished
+        :type generation: int
+        :return: Whether to save
+        :rtype: bool
+        """
+        if self.generations is None and self.seconds is None:
+            return True
+        if (
+            self.generations is not None
+            and generation % self.generations == 0
+        ):
+            return True
+        return (
+            self.seconds is not None
+            and time.perf_counter() - self.last_save >= self.seconds
+        )
+
+    def save(self, state):
+        """ Write a state atomically to path.
+
+        :param state: Arrays, scalars, strings and the random generator of
+        the run
+        :type state: dict
+        :return: NoneType
+        :rtype: NoneType
+        """
+        state = dict(state)
+        if self.generations is not None:
+            state["checkpoint_generations"] = self.generations
+        if self.seconds is not None:
+            state["checkpoint_seconds"] = self.seconds
+        save(self.path, state)
+        self.last_save = time.perf_counter()
+        self.saves += 1
+
+
+def save(path, state):
+    """ Write a state to an .npz file through a temporary file and a rename.
+    The random generator is stored as its JSON encoded bit generator state.
+
+    :param path: Path of the checkpoint file
+    :type path: str
+    :param state: Arrays, scalars, strings and the random generator of the
+    run
+    :type state: dict
+    :return: NoneType
+    :rtype: NoneType
+    """
+    arrays = {}
+    for name, value in state.items():
+        if isinstance(value, np.random.Generator):
+            value = json.dumps(value.bit_generator.state,
+                               default=lambda array: array.tolist())
+        arrays[name] = np.asarray(value)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        np.savez(file, **arrays)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def load(path):
+    """ Read a state written by save.
+
+    :param path: Path of the checkpoint file
+    :type path: str
+    :return: State with scalars as python values and rng as a generator in
+    the saved state
+    :rtype: dict
+    """
+    with np.load(path) as data:
+        state = {
+            name: data[name].item() if data[name].ndim == 0 else data[name]
+            for name in data.files
+        }
+    bit_generator_state = json.loads(state["rng"])
+    bit_generator = getattr(
+        np.random, bit_generator_state["bit_generator"]
+    )()
+    bit_generator.state = bit_generator_state
+    state["rng"] = np.random.Generator(bit_generator)
+    return state
+
+
+def resume(
+        path, test_function=None, evaluator=None, history=None,
+        stopping=None, checkpoint=None
+):
+    """ Continue a checkpointed run until it ends.
+
+    :param path: Path of the checkpoint file
+    :type path: str
+    :param test_function: Objective of a DE run, defaults to None (import
+    the function the run was started with by its module and name)
+    :type test_function: callable, optional
+    :param evaluator: Evaluator fitness batches are sent to, defaults to None
+    :type evaluator: PoolEvaluator, optional
+    :param history: History recorder of a DE run, defaults to None (as DE)
+    :type history: BestHistory, optional
+    :param stopping: Stopping criterion, started again at the resumed
+    generation, defaults to None (as the engine)
+    :type stopping: StoppingCriterion, optional
+    :param checkpoint: Checkpoint of the resumed run, defaults to None (keep
+    saving to path at the intervals of the interrupted run)
+    :type checkpoint: Checkpoint, optional
+    :return: (results, all_pops, generation_count) of DE, or the Genetic
+    instance after run
+    :rtype: tuple or Genetic
+    """
+    state = load(path)
+    if checkpoint is None:
+        checkpoint = Checkpoint(
+            path, state.get("checkpoint_generations"),
+            state.get("checkpoint_seconds")
+        )
+    if state["engine"] == "de":
+        if test_function is None:
+            module, name = state["test_function"].split(":")
+            test_function = importlib.import_module(module)
+            for attribute in name.split("."):
+                test_function = getattr(test_function, attribute)
+        return resume_DE(state, test_function, history, stopping, evaluator,
+                         checkpoint)
+    if state["engine"] == "ga":
+        genetic = Genetic.from_state(state, evaluator)
+        genetic.run(
+            state["crossover_method"], state["parent_selection_method"],
+            state["survival_selection_method"],
+            state["mutation_selection_probability"],
+            state["mutation_gene_probability"], state["mutation_method"],
+            stopping, checkpoint
+        )
+        return genetic
+    raise ValueError(f"unknown engine {state['engine']!r}")
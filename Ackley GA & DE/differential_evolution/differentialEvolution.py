@@ -1,9 +1,14 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import numpy as np
 
-from differential_evolution.ackley import Ackley
 import constant
+from history import EveryKHistory
+from sampling import sample_without_replacement
 
-def DE(test_function, dimension, bounds, F_scale, cross_prob, popsize, max_evals):
+def DE(test_function, dimension, bounds, F_scale, cross_prob, popsize, max_evals, mode="sequential",
+       history=None, stopping=None, evaluator=None, rng=None, checkpoint=None):
     """
     Differential Evolution algorithm
 
@@ -16,68 +21,353 @@ def DE(test_function, dimension, bounds, F_scale, cross_prob, popsize, max_evals
     popsize -- the population size
     max_evals -- the maximum fitness evaluation for the algorithm
     seed_number -- value of seed we want to run
+    mode -- "sequential" replaces each individual as soon as its trial is evaluated,
+            "generational" builds every trial of a generation as one (popsize x dimension)
+            array, evaluates them in a single test_function call and replaces the whole
+            population at once. In generational mode test_function receives the trials
+            as one (popsize x dimension) array and returns popsize values, like the
+            functions in test_function
+    history -- recorder from history.py deciding what is kept per generation (NoHistory,
+               BestHistory, EveryKHistory or FullHistory), defaults to EveryKHistory(1),
+               a copy of every population. trajectory.TrajectoryHistory writes the
+               populations and fitnesses to disk for replay
+    stopping -- stopping criterion checked after every generation, any object with start() and
+                check(state) such as the ones in ../stopping.py. After the run its fired
+                attribute tells what stopped it (None when max_evals did). Defaults to stopping
+                once the best fitness is below eps
+    evaluator -- evaluator the initial population and, in generational mode, every
+                 generation's trials are sent to in one batch, any object with
+                 evaluate(function, candidates, vectorized) such as PoolEvaluator in
+                 ../evaluator.py. Sequential mode evaluates its trials one by one in this
+                 thread, since each trial depends on the replacements before it
+    rng -- numpy.random.Generator every random draw of the run comes from, or a seed (int or
+           numpy.random.SeedSequence) to create one from. Defaults to a fresh unseeded generator
+    checkpoint -- saver of the run state, any object with start(), due(generation) and
+                  save(state) such as Checkpoint in ../checkpoint.py. At the end of every
+                  generation where due returns True, save receives the population, fitness,
+                  best, counters, parameters and generator needed by resume_DE. Defaults to None
+                  (no checkpoints)
 
     Returns:
     results -- best results after finishing the algorithm
-    all_pops -- all the population
+    all_pops -- all the population kept by the history recorder
     """
-    eps = 0.00001
+    rng = np.random.default_rng(rng)
 
     bound_lower, bound_upper = np.asarray(bounds).T
 
     diff = np.fabs(bound_lower - bound_upper)
 
-    pop = bound_lower + diff * np.random.rand(popsize, dimension)
+    pop = bound_lower + diff * rng.random((popsize, dimension))
+
+    evaluate = _evaluate_function(test_function, mode, evaluator)
 
-    fitness = np.asarray([test_function(ind) for ind in pop])
+    fitness = np.asarray(evaluate(pop), dtype=float)
     num_eval = 1
 
     best_idx = np.argmin(fitness)
-    best = pop[best_idx]
 
-    results = []
-    all_pops = []
-    results.append((np.copy(best), fitness[best_idx], num_eval))
-    all_pops.append(np.copy(pop))
-    generation_count = 0
+    if history is None:
+        history = EveryKHistory(1)
+    history.start(popsize, dimension, int((max_evals - 1) // popsize) + 2)
+    history.record(0, pop, fitness, pop[best_idx], fitness[best_idx], num_eval)
+
+    options = {"dimension": dimension, "bounds": np.asarray(bounds, dtype=float), "F_scale": F_scale,
+               "cross_prob": cross_prob, "popsize": popsize, "max_evals": max_evals, "mode": mode}
+    return _evolve(test_function, evaluate, options, rng, pop, fitness, best_idx, num_eval, 0,
+                   history, stopping, checkpoint)
+
+
+def resume_DE(state, test_function, history=None, stopping=None, evaluator=None, checkpoint=None):
+    """
+    Continue a DE run from a checkpoint state, with the generator as it was saved, so the run
+    ends exactly as it would have without the interruption.
+
+    Args:
+    state -- dict handed to checkpoint.save by DE, e.g. from checkpoint.load
+    test_function -- the function the run was started with
+    history, stopping, evaluator, checkpoint -- as in DE. The best results recorded before the
+                 checkpoint are restored, populations are only kept from the resumed
+                 generation on. Stopping criteria start again, so a stagnation or wall clock
+                 count restarts at the resumed generation
+
+    Returns:
+    as DE
+    """
+    options = {name: state[name] for name in _OPTIONS}
+    evaluate = _evaluate_function(test_function, options["mode"], evaluator)
+
+    if history is None:
+        history = EveryKHistory(1)
+    history.start(options["popsize"], options["dimension"],
+                  int((options["max_evals"] - 1) // options["popsize"]) + 2)
+    history.results[:] = [
+        (best, best_fitness, int(num_eval))
+        for best, best_fitness, num_eval
+        in zip(state["results_best"], state["results_fitness"], state["results_num_eval"])
+    ]
+
+    return _evolve(test_function, evaluate, options, state["rng"], np.array(state["pop"]),
+                   np.array(state["fitness"]), state["best_idx"], state["num_eval"],
+                   state["generation_count"], history, stopping, checkpoint)
+
+
+# Parameters of DE saved in a checkpoint
+_OPTIONS = ("dimension", "bounds", "F_scale", "cross_prob", "popsize", "max_evals", "mode")
+
+
+def _evaluate_function(test_function, mode, evaluator):
+    """
+    Function mapping an array of points to their fitness values for the given mode.
+    """
+    if evaluator is not None:
+        def evaluate(points):
+            return evaluator.evaluate(test_function, points, vectorized=mode == "generational")
+    elif mode == "generational":
+        evaluate = test_function
+    else:
+        def evaluate(points):
+            return [test_function(ind) for ind in points]
+    return evaluate
+
+
+def _evolve(test_function, evaluate, options, rng, pop, fitness, best_idx, num_eval, generation_count,
+            history, stopping, checkpoint):
+    """
+    Generation loop of DE, from a fresh initial population or from a checkpoint.
+
+    Returns:
+    as DE
+    """
+    eps = 0.00001
+    dimension, popsize = options["dimension"], options["popsize"]
+    F_scale, cross_prob = options["F_scale"], options["cross_prob"]
+    max_evals, mode = options["max_evals"], options["mode"]
+    bound_lower, bound_upper = options["bounds"].T
+
+    if stopping is not None:
+        stopping.start()
+    if checkpoint is not None:
+        checkpoint.start()
 
     while True:
         # max_evals = 10000 if popsize >= 512 else 5000
         if num_eval > max_evals:
             break
-        for i in range(popsize):
-            # Mutation step
-            idxes = [idx for idx in range(popsize) if idx != i]
-            a, b, c = pop[np.random.choice(idxes, 3, replace=False)]
-            mutant = np.clip(F_scale * (b - c) + a, bound_lower, bound_upper)
-
-            # Create cross point
-            cross_points = np.random.rand(dimension) < cross_prob
-            if not np.any(cross_points):
-                cross_points[np.random.randint(0, dimension)] = True
-
-            # Offspring
-            trial = np.where(cross_points, mutant, pop[i])
-
-            # Evaluate fitness
-            f = test_function(trial)
-            num_eval += 1
-
-            if f < fitness[i]:
-                pop[i] = trial
-                fitness[i] = f
-                if f < fitness[best_idx]:
-                    best = trial
-                    best_idx = i
-
-        results.append((np.copy(best), fitness[best_idx], num_eval))
-        all_pops.append(np.copy(pop))
-
-        if test_function(best) < eps:
-            num_eval += 1
+        if mode == "generational":
+            pop, fitness, num_eval = _generational_step(
+                evaluate, pop, fitness, num_eval, bound_lower, bound_upper, F_scale, cross_prob, rng)
+            best_idx = np.argmin(fitness)
+        else:
+            donors = _draw_donors(popsize, 3, rng)
+            for i in range(popsize):
+                # Mutation step
+                a, b, c = pop[donors[i]]
+                mutant = np.clip(F_scale * (b - c) + a, bound_lower, bound_upper)
+
+                # Create cross point
+                cross_points = rng.random(dimension) < cross_prob
+                if not np.any(cross_points):
+                    cross_points[rng.integers(0, dimension)] = True
+
+                # Offspring
+                trial = np.where(cross_points, mutant, pop[i])
+
+                # Evaluate fitness
+                f = test_function(trial)
+                num_eval += 1
+
+                if f < fitness[i]:
+                    pop[i] = trial
+                    fitness[i] = f
+                    if f < fitness[best_idx]:
+                        best_idx = i
+
+        # pop[best_idx] rather than the trial that became best, which goes stale when the best
+        # individual improves again
+        history.record(generation_count + 1, pop, fitness, pop[best_idx], fitness[best_idx], num_eval)
+
+        if stopping is None:
+            # fitness already holds the value of best, no need to evaluate it again
+            if fitness[best_idx] < eps:
+                break
+        elif stopping.check({"generation": generation_count + 1, "evaluations": num_eval,
+                             "best_fitness": fitness[best_idx], "population": pop,
+                             "fitness": fitness, "minimize": True}):
             break
 
         generation_count += 1
 
-    return results, all_pops, generation_count
+        if checkpoint is not None and checkpoint.due(generation_count):
+            checkpoint.save(dict(
+                options, engine="de",
+                test_function=f"{test_function.__module__}:{test_function.__qualname__}",
+                rng=rng, pop=pop, fitness=fitness, best_idx=best_idx, num_eval=num_eval,
+                generation_count=generation_count,
+                results_best=np.array([result[0] for result in history.results]).reshape(-1, dimension),
+                results_fitness=np.array([result[1] for result in history.results], dtype=float),
+                results_num_eval=np.array([result[2] for result in history.results], dtype=np.int64)))
+
+    history.finish()
+    return history.results, history.populations, generation_count
+
+
+def AsyncDE(test_function, dimension, bounds, F_scale, cross_prob, popsize, max_evals, evaluator=None,
+            workers=None, history=None, stopping=None, rng=None):
+    """
+    Asynchronous steady-state Differential Evolution (DE/rand/1/bin)
+
+    There is no generation barrier: a trial is submitted whenever a worker is free, built from
+    the population as it is at that moment, and replaces its target as soon as its fitness
+    arrives if it is better. A slow evaluation only holds up its own worker, so throughput
+    follows the number of workers even when evaluation times vary a lot. Which trials see which
+    replacements depends on timing, so runs are not repeatable like DE's.
+
+    Args:
+    test_function, dimension, bounds, F_scale, cross_prob, popsize, max_evals -- as in DE
+    evaluator -- where test_function runs, any object with get_executor() returning a
+                 concurrent.futures executor, such as PoolEvaluator in ../evaluator.py. Defaults
+                 to a thread pool of workers threads, shut down at the end of the run
+    workers -- number of trials in flight at once, defaults to evaluator.workers or the CPU count
+    history -- as in DE, a "generation" being every popsize evaluations
+    stopping -- as in DE, checked after every popsize evaluations
+    rng -- as in DE. The order results arrive in still depends on timing
+
+    Returns:
+    results -- best results after finishing the algorithm
+    all_pops -- all the population kept by the history recorder
+    generation_count -- number of popsize evaluation rounds
+    """
+    eps = 0.00001
+    rng = np.random.default_rng(rng)
+
+    bound_lower, bound_upper = np.asarray(bounds).T
+    diff = np.fabs(bound_lower - bound_upper)
+
+    if workers is None:
+        workers = getattr(evaluator, "workers", None) or os.cpu_count() or 1
+    if evaluator is None:
+        executor = ThreadPoolExecutor(workers)
+    else:
+        executor = evaluator.get_executor()
+
+    def make_trial(i):
+        # Mutation step, three distinct donors other than i
+        donors = sample_without_replacement(popsize, (), 3, rng, [i])
+        a, b, c = pop[donors]
+        mutant = np.clip(F_scale * (b - c) + a, bound_lower, bound_upper)
+
+        # Create cross point
+        cross_points = rng.random(dimension) < cross_prob
+        if not np.any(cross_points):
+            cross_points[rng.integers(0, dimension)] = True
+
+        return np.where(cross_points, mutant, pop[i])
+
+    try:
+        pop = bound_lower + diff * rng.random((popsize, dimension))
+        fitness = np.array(list(executor.map(test_function, pop)), dtype=float)
+        # Counted like DE, the initial population is one evaluation
+        num_eval = 1
+
+        best_idx = np.argmin(fitness)
+
+        if history is None:
+            history = EveryKHistory(1)
+        history.start(popsize, dimension, int((max_evals - 1) // popsize) + 2)
+        history.record(0, pop, fitness, pop[best_idx], fitness[best_idx], num_eval)
+        generation_count = 0
+        if stopping is not None:
+            stopping.start()
+
+        in_flight = {}
+        next_target = 0
+        stopped = False
+        while True:
+            # Keep every worker busy with a trial against the next target in turn
+            while not stopped and len(in_flight) < workers and num_eval + len(in_flight) <= max_evals:
+                trial = make_trial(next_target)
+                in_flight[executor.submit(test_function, trial)] = next_target, trial
+                next_target = (next_target + 1) % popsize
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, trial = in_flight.pop(future)
+                f = future.result()
+                num_eval += 1
+
+                if f < fitness[i]:
+                    pop[i] = trial
+                    fitness[i] = f
+                    if f < fitness[best_idx]:
+                        best_idx = i
+
+                if stopped or (num_eval - 1) % popsize != 0:
+                    continue
+
+                # A round of popsize evaluations finished
+                history.record(generation_count + 1, pop, fitness, pop[best_idx], fitness[best_idx],
+                               num_eval)
+                if stopping is None:
+                    stopped = fitness[best_idx] < eps
+                else:
+                    stopped = bool(stopping.check({
+                        "generation": generation_count + 1, "evaluations": num_eval,
+                        "best_fitness": fitness[best_idx], "population": pop, "fitness": fitness,
+                        "minimize": True}))
+                if not stopped:
+                    generation_count += 1
+    finally:
+        if evaluator is None:
+            executor.shutdown()
+
+    if not stopped and (num_eval - 1) % popsize != 0:
+        # Keep the replacements of the last, partial round
+        history.record(generation_count + 1, pop, fitness, pop[best_idx], fitness[best_idx], num_eval)
+    history.finish()
+    return history.results, history.populations, generation_count
+
+
+def _draw_donors(popsize, count, rng):
+    """
+    Draw count distinct donor indices for every individual, none of them equal to the
+    individual itself, for the whole population at once.
+    """
+    return sample_without_replacement(popsize, (popsize,), count, rng, np.arange(popsize)[:, None])
+
+
+def _generational_step(evaluate, pop, fitness, num_eval, bound_lower, bound_upper, F_scale, cross_prob, rng):
+    """
+    One synchronous DE/rand/1/bin generation over the whole population, evaluate maps a
+    (popsize x dimension) array of trials to their popsize fitness values.
+
+    Returns:
+    pop -- population after greedy selection
+    fitness -- fitness of the new population
+    num_eval -- updated number of fitness evaluations
+    """
+    popsize, dimension = pop.shape
+
+    # Mutation step
+    donors = _draw_donors(popsize, 3, rng)
+    a, b, c = pop[donors[:, 0]], pop[donors[:, 1]], pop[donors[:, 2]]
+    mutants = np.clip(F_scale * (b - c) + a, bound_lower, bound_upper)
+
+    # Create cross points, forcing one where a row has none
+    cross_points = rng.random((popsize, dimension)) < cross_prob
+    no_cross = np.flatnonzero(~np.any(cross_points, axis=1))
+    cross_points[no_cross, rng.integers(0, dimension, size=len(no_cross))] = True
+
+    # Offspring
+    trials = np.where(cross_points, mutants, pop)
+
+    # Evaluate fitness of every trial at once
+    f = np.asarray(evaluate(trials), dtype=float)
+    num_eval += popsize
 
+    improved = f < fitness
+    pop = np.where(improved[:, None], trials, pop)
+    fitness = np.where(improved, f, fitness)
+    return pop, fitness, num_eval
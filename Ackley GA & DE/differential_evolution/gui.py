@@ -1,108 +1,10 @@
 import tkinter as tk
 from tkinter import ttk
-import random
 import matplotlib.pyplot as plt
 import math
-import collections
 import io
-__all__ = ['DE']
-Individual = collections.namedtuple('Individual', 'ind fit')
 
-
-class DE(object):
-    """This class implements differential evolution."""
-
-    def __init__(self, x='rand', y=1, z='bin', F=.5, CR=.1):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.F = F
-        self.CR = CR
-
-    def solve(self, fitness, initial_population, iterations=1000):
-        current_generation = [Individual(ind, fitness(*ind)) for ind in initial_population]
-        best_fitnesses = []  # To store the best fitness values over iterations
-
-        for _ in range(iterations):
-            trial_generation = []
-
-            for ind in current_generation:
-                v = self._mutate(current_generation)
-                u = self._crossover(ind.ind, v)
-                trial_generation.append(Individual(u, fitness(*u)))
-
-            current_generation = self._selection(current_generation, trial_generation)
-
-            # Track the best fitness value
-            best_fitness = min(ind.fit for ind in current_generation)
-            best_fitnesses.append(best_fitness)
-
-        best_index = self._get_best_index(current_generation)
-        best_solution = current_generation[best_index].ind
-        return best_solution, best_fitnesses
-
-    def _mutate(self, population):
-        if self.x == 'rand':
-            r1, *r = self._get_indices(self.y * 2 + 1, len(population))
-        elif self.x == 'best':
-            r1 = self._get_best_index(population)
-            r = self._get_indices(self.y * 2, len(population), but=r1)
-
-        mutated = population[r1].ind[:]  # copy base vector
-        dimension = len(mutated)
-        difference = [0] * dimension
-
-        for plus in r[:self.y]:
-            for i in range(dimension):
-                difference[i] += population[plus].ind[i]
-
-        for minus in r[self.y:]:
-            for i in range(dimension):
-                difference[i] -= population[minus].ind[i]
-
-        for i in range(dimension):
-            mutated[i] += self.F * difference[i]
-
-        return mutated
-
-    def _crossover(self, x, v):
-        u = x[:]
-        i = random.randrange(len(x))  # NP
-
-        for j, (a, b) in enumerate(zip(x, v)):
-            if i == j or random.random() <= self.CR:
-                u[j] = v[j]
-
-        return u
-
-    def _selection(self, current_generation, trial_generation):
-        generation = []
-
-        for a, b in zip(current_generation, trial_generation):
-            if a.fit < b.fit:
-                generation.append(a)
-            else:
-                generation.append(b)
-
-        return generation
-
-    def _get_indices(self, n, upto, but=None):
-        candidates = list(range(upto))
-
-        if but is not None:
-            candidates.remove(but)
-
-        return random.sample(candidates, n)
-
-    def _get_best_index(self, population):
-        min_fitness = population[0].fit
-        best = 0
-
-        for i, x in enumerate(population):
-            if x.fit < min_fitness:
-                best = i
-
-        return best
+from df import DE
 
 
 class DifferentialEvolutionGUI:
@@ -192,7 +94,7 @@ class DifferentialEvolutionGUI:
         # Initialize DE with user-defined parameters
         de = DE(x=x_strategy, y=y_vectors, z=z_scheme, F=F_weight, CR=CR_probability)
         bound = 32.768
-        pop = [[random.uniform(-bound, bound), random.uniform(-bound, bound)] for _ in range(population_size)]
+        pop = de.rng.uniform(-bound, bound, (population_size, 2)).tolist()
 
         # Run DE
         best_solution, best_fitnesses = de.solve(ackley_2d, pop, iterations=max_generations)
@@ -0,0 +1,111 @@
+import numpy as np
+from numpy.lib.format import open_memmap
+
+
+class NoHistory(object):
+    """Keeps only the latest (best, fitness, num_eval) result and no populations."""
+
+    def __init__(self):
+        self.results = []
+
+    def start(self, popsize, dimension, max_generations):
+        """Called once before the first record with the shape of the run."""
+        pass
+
+    def finish(self):
+        """Called once after the last record."""
+        pass
+
+    def record(self, generation, pop, fitness, best, best_fitness, num_eval):
+        self.results[:] = [(np.copy(best), best_fitness, num_eval)]
+
+    @property
+    def populations(self):
+        return []
+
+    @property
+    def generations(self):
+        """Generation number of each stored population."""
+        return []
+
+
+class BestHistory(NoHistory):
+    """Keeps the best result of every generation, O(generations * dimension) memory."""
+
+    def record(self, generation, pop, fitness, best, best_fitness, num_eval):
+        self.results.append((np.copy(best), best_fitness, num_eval))
+
+
+class EveryKHistory(BestHistory):
+    """Also keeps a copy of the population every k-th generation (k=1 is the full list)."""
+
+    def __init__(self, k=1):
+        BestHistory.__init__(self)
+        self.k = k
+        self._populations = []
+        self._generations = []
+
+    def record(self, generation, pop, fitness, best, best_fitness, num_eval):
+        BestHistory.record(self, generation, pop, fitness, best, best_fitness, num_eval)
+        if generation % self.k == 0:
+            self._populations.append(np.copy(pop))
+            self._generations.append(generation)
+
+    @property
+    def populations(self):
+        return self._populations
+
+    @property
+    def generations(self):
+        return self._generations
+
+
+class FullHistory(BestHistory):
+    """
+    Keeps every population in one preallocated (capacity x popsize x dimension) buffer.
+
+    Without a path the buffer lives in memory and works as a ring: once capacity generations
+    are stored the oldest is overwritten. With a path the buffer is a memory-mapped .npy file
+    on disk, so long runs keep resident memory flat. capacity defaults to the number of
+    generations the run can reach, so nothing is overwritten.
+    """
+
+    def __init__(self, capacity=None, path=None):
+        BestHistory.__init__(self)
+        self.capacity = capacity
+        self.path = path
+        self.count = 0
+        self._buffer = None
+
+    def start(self, popsize, dimension, max_generations):
+        if self.capacity is None:
+            self.capacity = max_generations
+        shape = (self.capacity, popsize, dimension)
+        if self.path is None:
+            self._buffer = np.empty(shape)
+        else:
+            self._buffer = open_memmap(self.path, mode='w+', dtype=float, shape=shape)
+
+    def record(self, generation, pop, fitness, best, best_fitness, num_eval):
+        BestHistory.record(self, generation, pop, fitness, best, best_fitness, num_eval)
+        self._buffer[self.count % self.capacity] = pop
+        self.count += 1
+
+    @property
+    def populations(self):
+        if self.count <= self.capacity:
+            return self._buffer[:self.count]
+        # Oldest stored generation first
+        return self._buffer[(np.arange(self.capacity) + self.count) % self.capacity]
+
+    @property
+    def generations(self):
+        return list(range(max(0, self.count - self.capacity), self.count))
+
+    def finish(self):
+        self.flush()
+
+    def flush(self):
+        """Write pending pages of a memory-mapped buffer to disk."""
+        if isinstance(self._buffer, np.memmap):
+            self._buffer.flush()
@@ -0,0 +1,102 @@
+import os
+import time
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+_grids = {}
+_plots = {}
+
+
+def landscape_grid(test_function, bounds, resolution=100, cache_dir=None):
+    """
+    Meshgrid of test_function over the square bounds = (lower, upper), computed once per
+    (function, bounds, resolution).
+
+    Args:
+    test_function -- vectorized function from test_function, called with [X, Y]
+    bounds -- (lower, upper) of both axes
+    resolution -- number of grid points on each axis
+    cache_dir -- if given, Z is also kept in cache_dir as a .npy file and reused across runs
+
+    Returns:
+    X, Y, Z -- (resolution x resolution) arrays
+    """
+    lower, upper = bounds
+    key = (test_function.__module__, test_function.__qualname__, lower, upper, resolution)
+    if key in _grids:
+        return _grids[key]
+
+    x = np.linspace(lower, upper, resolution)
+    X, Y = np.meshgrid(x, x)
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = os.path.join(cache_dir, "%s_%s_%s_%d.npy" % (test_function.__qualname__, lower, upper,
+                                                                  resolution))
+    if cache_file is not None and os.path.exists(cache_file):
+        Z = np.load(cache_file)
+    else:
+        Z = test_function([X, Y])
+        if cache_file is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.save(cache_file, Z)
+
+    _grids[key] = X, Y, Z
+    return _grids[key]
+
+
+class LandscapePlot(object):
+    """
+    Contour plot of a landscape with one population scatter on top.
+
+    The contour is drawn once and its pixels are saved, each frame only restores them and
+    redraws the scatter (blitting), so a frame costs what the scatter costs.
+    """
+
+    def __init__(self, test_function, bounds, resolution=100, levels=32, cache_dir=None):
+        X, Y, Z = landscape_grid(test_function, bounds, resolution, cache_dir)
+        self.fig, self.ax = plt.subplots(figsize=(12, 12))
+        self.ax.contourf(X, Y, Z, levels, cmap='viridis')
+        self.ax.axis('square')
+        self.ax.scatter(0, 0, marker='*')
+        self.scatter = self.ax.scatter([], [], c='#ff0000', marker='o', animated=True)
+        self.background = None
+        self.fig.canvas.mpl_connect('draw_event', self._save_background)
+
+    def _save_background(self, event=None):
+        # A full redraw (plt.show, resize) skips the animated scatter, save the contour and put
+        # the scatter back on top so the last population stays on screen
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self.scatter)
+
+    def show(self):
+        plt.show(block=False)
+        self.fig.canvas.draw()
+
+    def draw_population(self, population):
+        """Restore the saved contour and draw the first two coordinates of population on it."""
+        if self.background is None:
+            self.fig.canvas.draw()
+        canvas = self.fig.canvas
+        canvas.restore_region(self.background)
+        self.scatter.set_offsets(np.asarray(population)[:, :2])
+        self.ax.draw_artist(self.scatter)
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def replay(self, populations, pause=0.01):
+        """Draws every population of an iterable, e.g. a trajectory.Trajectory, in turn."""
+        self.show()
+        for population in populations:
+            self.draw_population(population)
+            if pause:
+                time.sleep(pause)
+
+
+def landscape_plot(test_function, bounds, resolution=100, levels=32, cache_dir=None):
+    """LandscapePlot for (test_function, bounds, resolution, levels), created once and reused."""
+    key = (test_function.__module__, test_function.__qualname__, tuple(bounds), resolution, levels)
+    plot = _plots.get(key)
+    if plot is None or not plt.fignum_exists(plot.fig.number):
+        plot = _plots[key] = LandscapePlot(test_function, bounds, resolution, levels, cache_dir)
+    return plot
@@ -5,36 +5,18 @@ from constant import seed_number, bound_lower, bound_upper, max_evals, F_scale,
 from constant import popsize, max_evals, dimension
 
 from differentialEvolution import DE
-from celluloid import Camera
+from trajectory import Trajectory, TrajectoryHistory
+from landscape import landscape_plot
 
 
-def DifferentialEvolution(test_function, dimension, bound_lower, bound_upper, F_scale, cross_prob, popsize, max_evals):
-    np.random.rand(seed_number)
-
-    results, all_pops, generation_count = DE(test_function, dimension, [(bound_lower, bound_upper)] * dimension,
-                                             F_scale, cross_prob, popsize, max_evals)
-    bound_lower = -6
-    bound_upper = 6
-    x = np.linspace(bound_lower, bound_upper, 100)
-    y = np.linspace(bound_lower, bound_upper, 100)
-    X, Y = np.meshgrid(x, y)
-    Z = test_function([X, Y])
-
-    fig = plt.figure(figsize=(12, 12))
-    camera = Camera(fig)
-    plt.contourf(X, Y, Z, popsize, cmap='viridis')
-    plt.axis('square')
-    plt.scatter(0, 0, marker='*')
-
-    for generation in range(generation_count):
-        plt.contourf(X, Y, Z, popsize, cmap='viridis')
-        plt.axis('square')
-        plt.scatter(0, 0, marker='*')
-        plt.scatter(all_pops[generation][:, 0], all_pops[generation][:, 1], c='#ff0000', marker='o')
-        plt.plot()
-        plt.pause(0.01)
-        camera.snap()
-    plt.show()
+def DifferentialEvolution(test_function, trajectory_path):
+    # Replay the populations a DE run wrote with TrajectoryHistory instead of running it again.
+    # The window stays open until the plt.show() after the sweep, so the contour is drawn once and
+    # reused for every popsize. It has a fixed 32 levels instead of one level per individual, which
+    # would need a new contour for each popsize
+    trajectory = Trajectory(trajectory_path)
+    plot = landscape_plot(test_function, (-6, 6), resolution=100, levels=32, cache_dir="landscapes")
+    plot.replay(trajectory)
 
 
 if __name__ == '__main__':
@@ -52,7 +34,10 @@ if __name__ == '__main__':
         if dimension == 2:
             max_evals = 1e5
             bounds = [(bound_lower, bound_upper)] * dimension
-            results, _, _ = DE(test_function, dimension, bounds, F_scale, cross_prob, popsize, max_evals)
+            trajectory_path = f"trajectories/popsize_{popsize}"
+            results, _, _ = DE(test_function, dimension, bounds, F_scale, cross_prob, popsize, max_evals,
+                               mode="generational", history=TrajectoryHistory(trajectory_path),
+                               rng=seed_number)
 
             # Extract fitness values from results
             fitness_values = [result[1] for result in results]
@@ -65,8 +50,8 @@ if __name__ == '__main__':
             best_fitness = min(fitness_values)
             best_fitnesses.append(best_fitness)
 
-            DifferentialEvolution(test_function, dimension, bound_lower, bound_upper, F_scale, cross_prob, popsize,
-                                  max_evals)
+            DifferentialEvolution(test_function, trajectory_path)
 
     # Print the best fitness value obtained for each population size
     print("Best fitness values:", best_fitnesses)
+    plt.show()
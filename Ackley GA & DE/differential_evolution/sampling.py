@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def sample_without_replacement(candidate_count, shape, count, rng, excluded=None):
+    """
+    Draw count distinct indices below candidate_count for every entry of shape at once, none of
+    them among the entry's excluded indices.
+
+    Each index is drawn from the slots still free in its entry and shifted past the smaller
+    indices already taken (excluded ones and earlier draws), so nothing is rejected and no
+    candidate list is built. An entry costs O((excluded + count) * count) whatever
+    candidate_count is.
+
+    Args:
+    candidate_count -- number of candidates, indices are drawn from range(candidate_count)
+    shape -- shape of the independent draws, e.g. (popsize,) for one draw per individual
+    count -- number of distinct indices in each draw
+    rng -- numpy.random.Generator the draws come from
+    excluded -- indices never drawn, an array of shape + (k,) or one broadcastable to it (e.g.
+                np.arange(popsize)[:, None] to keep every individual out of its own draw).
+                An index may be repeated in an entry. Defaults to None (nothing excluded)
+
+    Returns:
+    indices -- integer array of shape + (count,)
+    """
+    shape = tuple(shape)
+    if excluded is None:
+        taken = np.empty(shape + (0,), dtype=int)
+    else:
+        excluded = np.asarray(excluded, dtype=int)
+        taken = np.sort(np.broadcast_to(excluded, shape + excluded.shape[-1:]), axis=-1)
+    # A repeated exclusion only takes one slot, move the copies out of range
+    duplicate = np.zeros(taken.shape, dtype=bool)
+    duplicate[..., 1:] = taken[..., 1:] == taken[..., :-1]
+    taken = np.where(duplicate, candidate_count, taken)
+    free = candidate_count - np.count_nonzero(~duplicate, axis=-1)
+
+    indices = np.empty(shape + (count,), dtype=int)
+    for j in range(count):
+        draw = rng.integers(0, free - j, size=shape)
+        for column in np.moveaxis(taken, -1, 0):
+            draw += draw >= column
+        indices[..., j] = draw
+        taken = np.sort(np.concatenate([taken, draw[..., None]], axis=-1), axis=-1)
+    return indices
@@ -1,16 +1,51 @@
 import numpy as np
 
 
+def _as_points(d):
+    """
+    Coordinates of the points to evaluate, on the last axis.
+
+    An array is read as (N x D) (or a single point of shape (D,)); a list or tuple such as
+    [X, Y] holds one coordinate array per item, the meshgrid form used for contour plots.
+    """
+    if isinstance(d, (list, tuple)):
+        return np.stack(np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in d]), axis=-1)
+    return np.asarray(d, dtype=float)
+
+
 def Ackley(d):
     a = 20
     b = 0.2
     c = 2 * np.pi
-    sum1 = 0
-    sum2 = 0
-    for i in range(len(d)):
-        sum1 += d[i] ** 2
-        sum2 += np.cos(c * d[i])
-    term1 = -a * np.exp(-b * np.sqrt(sum1 / len(d)))
-    term2 = -np.exp(sum2 / len(d))
-
-    return term1 + term2 + a + np.exp(1)
\ No newline at end of file
+    x = _as_points(d)
+    dimension = x.shape[-1]
+    term1 = -a * np.exp(-b * np.sqrt(np.sum(x ** 2, axis=-1) / dimension))
+    term2 = -np.exp(np.sum(np.cos(c * x), axis=-1) / dimension)
+
+    return term1 + term2 + a + np.exp(1)
+
+
+# Weighted sum of squares, sum(i * x_i ** 2), the objective of both sum-of-squares engines: the GA
+# chromosome decodes it as x ** 2 + 2 * y ** 2 and the DE calls this function
+def SumOfSquares(d):
+    x = _as_points(d)
+    weights = np.arange(1, x.shape[-1] + 1)
+    return np.sum(weights * x ** 2, axis=-1)
+
+
+# The Sphere, Rastrigin and Rosenbrock notebooks keep inline copies of the functions below, so
+# each notebook still runs on its own
+def Sphere(d):
+    x = _as_points(d)
+    return np.sum(x ** 2, axis=-1)
+
+
+def Rastrigin(d):
+    A = 10
+    x = _as_points(d)
+    return A * x.shape[-1] + np.sum(x ** 2 - A * np.cos(2 * np.pi * x), axis=-1)
+
+
+def Rosenbrock(d):
+    x = _as_points(d)
+    return np.sum(100 * (x[..., 1:] - x[..., :-1] ** 2) ** 2 + (1 - x[..., :-1]) ** 2, axis=-1)
@@ -0,0 +1,165 @@
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from history import BestHistory
+
+INDEX_FILE = "index.npz"
+
+
+def _chunk_files(path, chunk):
+    return (os.path.join(path, "populations_%05d.npy" % chunk),
+            os.path.join(path, "fitness_%05d.npy" % chunk))
+
+
+class TrajectoryHistory(BestHistory):
+    """
+    Writes every population and its fitness to an on-disk trajectory.
+
+    The trajectory is a directory of chunk files, populations_XXXXX.npy of shape
+    (chunk_size x popsize x dimension) and fitness_XXXXX.npy of shape (chunk_size x popsize),
+    plus index.npz holding the first frame of each chunk, the generation number, best point,
+    best fitness and evaluation count of every frame. Only the chunk being written is open, so
+    memory stays flat however long the run is. The index is rewritten each time a chunk closes,
+    so the frames of the closed chunks can be read back with Trajectory while the run is going
+    or after it crashed.
+    """
+
+    def __init__(self, path, chunk_size=64):
+        BestHistory.__init__(self)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._generations = []
+        self._chunk_starts = []
+        self._populations = None
+        self._fitness = None
+
+    def start(self, popsize, dimension, max_generations):
+        os.makedirs(self.path, exist_ok=True)
+        self.popsize = popsize
+        self.dimension = dimension
+
+    def _open_chunk(self):
+        chunk = len(self._chunk_starts)
+        populations_file, fitness_file = _chunk_files(self.path, chunk)
+        self._populations = open_memmap(populations_file, mode='w+', dtype=float,
+                                        shape=(self.chunk_size, self.popsize, self.dimension))
+        self._fitness = open_memmap(fitness_file, mode='w+', dtype=float,
+                                    shape=(self.chunk_size, self.popsize))
+        self._chunk_starts.append(self.count)
+
+    def _close_chunk(self):
+        rows = self.count - self._chunk_starts[-1]
+        populations_file, fitness_file = _chunk_files(self.path, len(self._chunk_starts) - 1)
+        if rows == self.chunk_size:
+            self._populations.flush()
+            self._fitness.flush()
+            self._populations = self._fitness = None
+        else:
+            # Shrink the last chunk to the frames actually written
+            populations = np.array(self._populations[:rows])
+            fitness = np.array(self._fitness[:rows])
+            self._populations = self._fitness = None
+            np.save(populations_file, populations)
+            np.save(fitness_file, fitness)
+        self._write_index()
+
+    def _write_index(self):
+        # Written to a temporary file and renamed, so a reader never sees half an index
+        index_file = os.path.join(self.path, INDEX_FILE)
+        with open(index_file + '.tmp', 'wb') as file:
+            np.savez(file,
+                     chunk_starts=np.array(self._chunk_starts, dtype=np.int64),
+                     generations=np.array(self._generations, dtype=np.int64),
+                     best=np.array([result[0] for result in self.results]).reshape(-1, self.dimension),
+                     best_fitness=np.array([result[1] for result in self.results], dtype=float),
+                     num_evals=np.array([result[2] for result in self.results], dtype=np.int64))
+        os.replace(index_file + '.tmp', index_file)
+
+    def record(self, generation, pop, fitness, best, best_fitness, num_eval):
+        BestHistory.record(self, generation, pop, fitness, best, best_fitness, num_eval)
+        if self._populations is None:
+            self._open_chunk()
+        offset = self.count - self._chunk_starts[-1]
+        self._populations[offset] = pop
+        self._fitness[offset] = fitness
+        self._generations.append(generation)
+        self.count += 1
+        if offset + 1 == self.chunk_size:
+            self._close_chunk()
+
+    def finish(self):
+        if self._populations is not None:
+            self._close_chunk()
+        else:
+            self._write_index()
+
+    @property
+    def populations(self):
+        """The written populations, replayed from disk."""
+        return Trajectory(self.path)
+
+    @property
+    def generations(self):
+        return self._generations
+
+
+class Trajectory(object):
+    """
+    Read-only view of a trajectory written by TrajectoryHistory.
+
+    Chunks are memory-mapped on demand, so indexing or iterating streams frames from disk
+    without loading the whole history. trajectory[i] is the population of frame i.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with np.load(os.path.join(path, INDEX_FILE)) as index:
+            self.chunk_starts = index['chunk_starts']
+            self.generations = index['generations']
+            self.best = index['best']
+            self.best_fitness = index['best_fitness']
+            self.num_evals = index['num_evals']
+        self._chunk = None
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.generations)
+
+    def _load_chunk(self, chunk):
+        if chunk != self._chunk:
+            populations_file, fitness_file = _chunk_files(self.path, chunk)
+            self._arrays = (np.load(populations_file, mmap_mode='r'),
+                            np.load(fitness_file, mmap_mode='r'))
+            self._chunk = chunk
+        return self._arrays
+
+    def frame(self, i):
+        """Returns (generation, population, fitness) of frame i as memory-mapped views."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("trajectory frame out of range")
+        chunk = int(np.searchsorted(self.chunk_starts, i, side='right')) - 1
+        populations, fitness = self._load_chunk(chunk)
+        offset = i - self.chunk_starts[chunk]
+        return self.generations[i], populations[offset], fitness[offset]
+
+    def __getitem__(self, i):
+        return self.frame(i)[1]
+
+    def frames(self, start=0, stop=None, step=1):
+        """Yields (generation, population, fitness) for frames start, start + step, ... < stop."""
+        for i in range(*slice(start, stop, step).indices(len(self))):
+            yield self.frame(i)
+
+    def __iter__(self):
+        for _, population, _ in self.frames():
+            yield population
+
+    @property
+    def results(self):
+        """The (best, best_fitness, num_eval) tuples DE returns as results."""
+        return list(zip(self.best, self.best_fitness, self.num_evals))
@@ -0,0 +1,135 @@
+"""
+Fitness evaluators shared by the genetic algorithm, differentialEvolution.DE
+and df.DE. An evaluator takes a batch of candidates and returns their fitness
+in the same order, so results do not depend on how many workers computed
+them.
+
+SerialEvaluator runs the batch in the calling process; PoolEvaluator splits
+it into chunks for a thread or process pool and reassembles the results.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+
+class SerialEvaluator():
+    """ Evaluates every candidate in the calling thread.
+
+    """
+    def evaluate(self, function, candidates, vectorized=False):
+        """ Fitness of each candidate.
+
+        :param function: Objective, called with one candidate, or with a
+        block of candidates (rows of an array) when vectorized is True
+        :type function: callable
+        :param candidates: Candidates to evaluate, one per row or item
+        :type candidates: numpy.ndarray or list
+        :param vectorized: Whether function takes a block of candidates and
+        returns one value per row, defaults to False
+        :type vectorized: bool, optional
+        :return: Fitness of each candidate, in order
+        :rtype: numpy.ndarray
+        """
+        if vectorized:
+            return np.asarray(function(candidates), dtype=float)
+        return np.array([function(candidate) for candidate in candidates],
+                        dtype=float)
+
+    def close(self):
+        """ Release the resources held by the evaluator.
+
+        :return: NoneType
+        :rtype: NoneType
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PoolEvaluator(SerialEvaluator):
+    """ Evaluates candidates on a concurrent.futures pool. The pool is
+    started on first use and kept until close(), so it is not respawned
+    every generation.
+
+    """
+    def __init__(self, workers=None, kind="process", chunk_size=None):
+        """
+        :param workers: Number of workers, defaults to None (the executor's
+        default)
+        :type workers: int, optional
+        :param kind: "process" for a ProcessPoolExecutor (function and
+        candidates must be picklable) or "thread" for a ThreadPoolExecutor
+        (for objectives that release the GIL), defaults to "process"
+        :type kind: str, optional
+        :param chunk_size: Candidates sent to a worker in one task (thread
+        pools only chunk vectorized objectives), defaults to None (a
+        vectorized batch split evenly over the workers, one candidate per
+        task otherwise)
+        :type chunk_size: int, optional
+        """
+        if kind not in ("process", "thread"):
+            raise ValueError(f"unknown pool kind {kind!r}")
+        self.workers = workers
+        self.kind = kind
+        self.chunk_size = chunk_size
+        self.executor = None
+
+    def get_executor(self):
+        """ The pool, started on first call.
+
+        :return: Executor of the evaluator
+        :rtype: concurrent.futures.Executor
+        """
+        if self.executor is None:
+            if self.kind == "process":
+                self.executor = ProcessPoolExecutor(self.workers)
+            else:
+                self.executor = ThreadPoolExecutor(self.workers)
+        return self.executor
+
+    def get_chunk_size(self, size):
+        """ Rows of a vectorized batch sent to a worker in one task.
+
+        :param size: Number of candidates in the batch
+        :type size: int
+        :return: chunk_size, or the batch split evenly over the workers
+        :rtype: int
+        """
+        return self.chunk_size or math.ceil(
+            size / (self.workers or os.cpu_count() or 1)
+        )
+
+    def evaluate(self, function, candidates, vectorized=False):
+        if len(candidates) == 0:
+            return np.empty(0)
+        executor = self.get_executor()
+        if vectorized:
+            # One task per block of rows, concatenated in order
+            chunk_size = self.get_chunk_size(len(candidates))
+            blocks = [
+                candidates[start:start + chunk_size]
+                for start in range(0, len(candidates), chunk_size)
+            ]
+            return np.concatenate([
+                np.asarray(values, dtype=float).reshape(-1)
+                for values in executor.map(function, blocks)
+            ])
+        # map returns results in submission order, whichever worker finished
+        # first
+        return np.array(
+            list(executor.map(function, candidates,
+                              chunksize=self.chunk_size or 1)),
+            dtype=float
+        )
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
@@ -0,0 +1,220 @@
+"""
+Headless experiment runner for the genetic algorithm and differential
+evolution.
+
+Every combination of a parameter grid is run a number of times on a process
+pool, each run with its own random stream, and one row per run is appended to
+a CSV file as soon as the run finishes.
+
+    python experiments.py grid.json --repetitions 10 --workers 8 \\
+        --seed 1 --output results.csv
+
+with grid.json holding a list of values for any parameter in DEFAULTS, e.g.
+
+    {"engine": ["de"], "objective": ["Ackley", "Rastrigin"],
+     "popsize": [32, 64, 128], "F": [0.5, 0.8], "CR": [0.1, 0.7]}
+
+Any row of the CSV is reproduced with
+
+    run_once(params, run_seed(row["seed"], row["run_id"]))
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import paths  # noqa: F401
+import test_function
+from differentialEvolution import DE
+from genetic import Genetic
+from history import BestHistory
+
+# Parameters of a run and their default values. engine is "ga" or "de";
+# objective is a function of differential_evolution/test_function.py (the GA
+# chromosome only decodes Ackley); bound gives the search box
+# [-bound, bound] of every dimension for DE.
+DEFAULTS = {
+    "engine": "de",
+    "objective": "Ackley",
+    "dimension": 2,
+    "bound": 5.0,
+    "popsize": 32,
+    "F": 0.8,
+    "CR": 0.7,
+    "max_evals": 100000,
+    "generations": 100,
+    "chromosome_size": 40,
+    "crossover": "3_point",
+    "parent_selection": "rws",
+    "survival_selection": "rws",
+    "mutation_selection": 1.0,
+    "mutation_gene": 0.1,
+}
+
+METRICS = ["best_fitness", "best_objective", "evaluations", "generations_run",
+           "seconds"]
+
+
+def expand_grid(grid):
+    """ Every combination of a parameter grid, missing parameters taking their
+    default value.
+
+    :param grid: Parameter name to a list of values (or a single value)
+    :type grid: dict
+    :return: One parameter dict per combination
+    :rtype: list
+    """
+    unknown = set(grid) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"unknown parameters {sorted(unknown)}")
+    names = list(grid)
+    values = [
+        grid[name] if isinstance(grid[name], (list, tuple)) else [grid[name]]
+        for name in names
+    ]
+    return [
+        dict(DEFAULTS, **dict(zip(names, combination)))
+        for combination in itertools.product(*values)
+    ]
+
+
+def run_seed(seed, run_id):
+    """ Random stream of one run, child run_id of SeedSequence(seed).
+
+    :param seed: Seed of the experiment
+    :type seed: int
+    :param run_id: Index of the run in the experiment
+    :type run_id: int
+    :return: Seed sequence of the run
+    :rtype: numpy.random.SeedSequence
+    """
+    # Same stream as SeedSequence(seed).spawn(run_id + 1)[run_id]
+    return np.random.SeedSequence(seed, spawn_key=(run_id,))
+
+
+def run_once(params, seed):
+    """ Run one engine with one parameter set.
+
+    :param params: Full parameter dict, see DEFAULTS
+    :type params: dict
+    :param seed: Seed of the run
+    :type seed: int or numpy.random.SeedSequence
+    :return: Metrics of the run
+    :rtype: dict
+    """
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    if params["engine"] == "ga":
+        if params["objective"] != "Ackley":
+            raise ValueError("the genetic algorithm only optimizes Ackley")
+        genetic = Genetic(
+            params["chromosome_size"], params["popsize"],
+            params["generations"], rng=rng
+        )
+        genetic.run(
+            crossover_method=params["crossover"],
+            parent_selection_method=params["parent_selection"],
+            survival_selection_method=params["survival_selection"],
+            mutation_selection_probability=params["mutation_selection"],
+            mutation_gene_probability=params["mutation_gene"]
+        )
+        best_fitness = genetic.best_chromosome.fitness
+        metrics = {
+            "best_fitness": best_fitness,
+            "best_objective": 21 - best_fitness,
+            "evaluations": genetic.evaluation_count,
+            "generations_run": genetic.generations_run,
+        }
+    elif params["engine"] == "de":
+        bounds = [(-params["bound"], params["bound"])] * params["dimension"]
+        results, _, generation_count = DE(
+            getattr(test_function, params["objective"]),
+            params["dimension"], bounds, params["F"], params["CR"],
+            params["popsize"], params["max_evals"], mode="generational",
+            history=BestHistory(), rng=rng
+        )
+        best_fitness = min(result[1] for result in results)
+        metrics = {
+            "best_fitness": best_fitness,
+            "best_objective": best_fitness,
+            "evaluations": results[-1][2],
+            "generations_run": generation_count,
+        }
+    else:
+        raise ValueError(f"unknown engine {params['engine']!r}")
+    metrics["seconds"] = time.perf_counter() - start
+    return metrics
+
+
+def _run(run_id, repetition, params, seed):
+    row = {"run_id": run_id, "repetition": repetition, "seed": seed}
+    row.update(params)
+    row.update(run_once(params, run_seed(seed, run_id)))
+    return row
+
+
+def run_experiments(grid, repetitions, output, workers=None, seed=0):
+    """ Run every grid combination repetitions times and write one CSV row
+    per run, in completion order.
+
+    :param grid: Parameter grid, see expand_grid
+    :type grid: dict
+    :param repetitions: Runs of each combination
+    :type repetitions: int
+    :param output: Path of the CSV file
+    :type output: str
+    :param workers: Number of worker processes, defaults to None (one per
+    CPU)
+    :type workers: int, optional
+    :param seed: Seed the runs' random streams are spawned from, run i
+    (the run_id column) always gets run_seed(seed, i) whatever the number
+    of workers, defaults to 0
+    :type seed: int, optional
+    :return: Number of runs
+    :rtype: int
+    """
+    runs = [
+        (params, repetition)
+        for params in expand_grid(grid)
+        for repetition in range(repetitions)
+    ]
+    fields = ["run_id", "repetition", "seed"] + list(DEFAULTS) + METRICS
+    with open(output, "w", newline="") as file, \
+            ProcessPoolExecutor(workers) as executor:
+        writer = csv.DictWriter(file, fields)
+        writer.writeheader()
+        futures = [
+            executor.submit(_run, run_id, repetition, params, seed)
+            for run_id, (params, repetition) in enumerate(runs)
+        ]
+        for future in as_completed(futures):
+            writer.writerow(future.result())
+            file.flush()
+    return len(runs)
+
+
+def main():
+    """ Main function
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("grid", help="JSON file with the parameter grid")
+    parser.add_argument("--repetitions", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="results.csv")
+    args = parser.parse_args()
+    with open(args.grid) as file:
+        grid = json.load(file)
+    count = run_experiments(
+        grid, args.repetitions, args.output, args.workers, args.seed
+    )
+    print(f"{count} runs written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Island model for the genetic algorithm and differential evolution.
+
+K islands each evolve their own population in a separate worker process.
+Every M generations each island sends its top m individuals along the
+topology ("ring", "full" or "random") and replaces its worst individuals with
+the best of what it received. The driver talks to the islands through pipes
+and keeps the global best.
+
+    model = IslandModel(DEIsland, dict(test_function=Rastrigin, dimension=10,
+                                       bounds=[(-5.12, 5.12)] * 10,
+                                       F_scale=0.8, cross_prob=0.7,
+                                       popsize=64),
+                        islands=4, migration_interval=10, migration_size=2)
+    best, best_fitness = model.run(epochs=50)
+"""
+
+import pickle
+import traceback
+from multiprocessing import Pipe, Process
+
+import numpy as np
+
+import paths  # noqa: F401
+from differentialEvolution import _generational_step
+from genetic import Genetic
+from population import Population
+
+TOPOLOGIES = ("ring", "full", "random")
+
+
+class GeneticIsland():
+    """ Island running the genetic algorithm (maximizes fitness).
+
+    """
+    minimize = False
+
+    def __init__(
+            self, chromosome_size, population_size, rng=None, **run_options
+    ):
+        """
+        :param chromosome_size: Size of each binary chromosome
+        :type chromosome_size: int
+        :param population_size: Size of the island population
+        :type population_size: int
+        :param rng: Random generator (or seed) of the island, defaults to
+        None (a fresh unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :param run_options: Keyword arguments of Genetic.run, e.g.
+        crossover_method or survival_selection_method
+        :type run_options: dict
+        """
+        self.genetic = Genetic(chromosome_size, population_size, 0, rng=rng)
+        self.run_options = run_options
+
+    def evolve(self, generations):
+        """ Run the given number of generations.
+
+        :param generations: Number of generations
+        :type generations: int
+        """
+        self.genetic.generation_count = generations
+        self.genetic.run(**self.run_options)
+
+    def emigrants(self, count):
+        """ Best individuals of the island.
+
+        :param count: Number of individuals
+        :type count: int
+        :return: Genotype matrix and fitness of the count best rows
+        :rtype: tuple
+        """
+        population = self.genetic.current_generation
+        best = np.argsort(-population.fitness, kind="stable")[:count]
+        return population.genotypes[best], population.fitness[best]
+
+    def immigrate(self, individuals, fitness):
+        """ Replace the worst individuals with the given ones.
+
+        :param individuals: Genotype matrix of the immigrants
+        :type individuals: numpy.ndarray
+        :param fitness: Fitness of the immigrants
+        :type fitness: numpy.ndarray
+        """
+        population = self.genetic.current_generation
+        worst = np.argsort(population.fitness, kind="stable")[:len(fitness)]
+        genotypes = population.genotypes.copy()
+        values = population.fitness.copy()
+        genotypes[worst] = individuals
+        values[worst] = fitness
+        self.genetic.current_generation = Population(
+            genotypes, population.minimum, population.maximum, values,
+            population.fitness_cache, population.evaluator, population.rng,
+            population.base
+        )
+        self.genetic.alias_table = None
+
+    def best(self):
+        """ Best individual found on the island so far.
+
+        :return: Genotype and fitness
+        :rtype: tuple
+        """
+        chromosome = self.genetic.best_chromosome
+        return np.array(chromosome.genotype, dtype=np.uint8), chromosome.fitness
+
+
+class DEIsland():
+    """ Island running generational DE/rand/1/bin (minimizes fitness).
+    test_function has to take a (popsize x dimension) array, like the
+    functions in differential_evolution/test_function.py.
+
+    """
+    minimize = True
+
+    def __init__(
+            self, test_function, dimension, bounds, F_scale, cross_prob,
+            popsize, rng=None
+    ):
+        self.rng = np.random.default_rng(rng)
+        self.test_function = test_function
+        self.F_scale = F_scale
+        self.cross_prob = cross_prob
+        self.bound_lower, self.bound_upper = np.asarray(bounds, dtype=float).T
+        diff = np.fabs(self.bound_lower - self.bound_upper)
+        self.pop = (
+            self.bound_lower + diff * self.rng.random((popsize, dimension))
+        )
+        self.fitness = np.asarray(test_function(self.pop), dtype=float)
+        # Counted as in differentialEvolution.DE, where the initial
+        # population is one evaluation, so budgets of both compare
+        self.num_eval = 1
+
+    def evolve(self, generations):
+        for _ in range(generations):
+            self.pop, self.fitness, self.num_eval = _generational_step(
+                self.test_function, self.pop, self.fitness, self.num_eval,
+                self.bound_lower, self.bound_upper, self.F_scale,
+                self.cross_prob, self.rng
+            )
+
+    def emigrants(self, count):
+        best = np.argsort(self.fitness, kind="stable")[:count]
+        return self.pop[best], self.fitness[best]
+
+    def immigrate(self, individuals, fitness):
+        worst = np.argsort(-self.fitness, kind="stable")[:len(fitness)]
+        self.pop[worst] = individuals
+        self.fitness[worst] = fitness
+
+    def best(self):
+        # Greedy selection never loses the best and immigrants only replace
+        # the worst, so the current best is the best found so far
+        best = np.argmin(self.fitness)
+        return self.pop[best].copy(), self.fitness[best]
+
+
+def _island_worker(connection, island_class, island_options, seed_sequence):
+    """ Worker process holding one island, driven by IslandModel.
+
+    Each message is (immigrants, generations, emigrant count); the island
+    takes the immigrants, evolves and replies (None, (emigrants, best)). None
+    stops the worker. If the island raises, the reply is ((exception,
+    traceback), None) instead and the worker only waits for None, so the
+    driver can re-raise the exception and still shut every worker down.
+    """
+    try:
+        island = island_class(
+            rng=np.random.default_rng(seed_sequence), **island_options
+        )
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            immigrants, generations, count = message
+            if immigrants is not None:
+                island.immigrate(*immigrants)
+            island.evolve(generations)
+            connection.send((None, (island.emigrants(count), island.best())))
+    except Exception as error:
+        remote_traceback = traceback.format_exc()
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(repr(error))
+        try:
+            connection.send(((error, remote_traceback), None))
+            while connection.recv() is not None:
+                pass
+        except (ConnectionError, EOFError):
+            # The driver already stopped, after another island failed
+            pass
+    connection.close()
+
+
+def _receive(connection, island):
+    """ Reply of an island worker, raising the exception of a failed island
+    with the worker traceback as its cause.
+
+    :param connection: Driver end of the island's pipe
+    :type connection: multiprocessing.connection.Connection
+    :param island: Index of the island
+    :type island: int
+    :return: Emigrants and best of the island
+    :rtype: tuple
+    """
+    error, reply = connection.recv()
+    if error is not None:
+        exception, remote_traceback = error
+        raise exception from RuntimeError(
+            f"island {island} failed in its worker:\n{remote_traceback}"
+        )
+    return reply
+
+
+class IslandModel():
+    """ Runs islands of one engine in worker processes with migration.
+
+    """
+    def __init__(
+            self, island_class, island_options, islands=4,
+            migration_interval=10, migration_size=2, topology="ring",
+            seed=None
+    ):
+        """
+        :param island_class: GeneticIsland or DEIsland
+        :type island_class: type
+        :param island_options: Keyword arguments of island_class
+        :type island_options: dict
+        :param islands: Number of islands (worker processes), defaults to 4
+        :type islands: int, optional
+        :param migration_interval: Generations between migrations, defaults
+        to 10
+        :type migration_interval: int, optional
+        :param migration_size: Individuals each island sends, defaults to 2
+        :type migration_size: int, optional
+        :param topology: "ring" (island k sends to k + 1), "full" (every
+        island sends to every other) or "random" (each island sends to
+        another island drawn at every migration), defaults to "ring"
+        :type topology: str, optional
+        :param seed: Seed (int or numpy.random.SeedSequence) of the run, every
+        island and the random topology get an independent child stream
+        spawned from it, so a run only depends on the seed, defaults to None
+        (unseeded)
+        :type seed: int, optional
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"unknown topology {topology!r}")
+        self.island_class = island_class
+        self.island_options = island_options
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.seed = seed
+        seed_sequence = seed
+        if not isinstance(seed, np.random.SeedSequence):
+            seed_sequence = np.random.SeedSequence(seed)
+        *self.island_seeds, topology_seed = seed_sequence.spawn(islands + 1)
+        self.rng = np.random.default_rng(topology_seed)
+        self.best = None
+        self.best_fitness = None
+        self.best_island = None
+        self.history = list()
+
+    def destinations(self, island):
+        """ Islands an island sends its emigrants to at one migration.
+
+        :param island: Index of the sending island
+        :type island: int
+        :return: Indices of the receiving islands
+        :rtype: list
+        """
+        if self.islands == 1:
+            return []
+        if self.topology == "ring":
+            return [(island + 1) % self.islands]
+        if self.topology == "full":
+            return [k for k in range(self.islands) if k != island]
+        other = int(self.rng.integers(self.islands - 1))
+        return [other + (other >= island)]
+
+    def route(self, emigrant_list):
+        """ Gather, for every island, the best migration_size individuals
+        sent to it.
+
+        :param emigrant_list: (individuals, fitness) sent by each island
+        :type emigrant_list: list
+        :return: (individuals, fitness) received by each island, None when
+        nothing was sent to it
+        :rtype: list
+        """
+        received = [[] for _ in range(self.islands)]
+        for island, emigrants in enumerate(emigrant_list):
+            for destination in self.destinations(island):
+                received[destination].append(emigrants)
+        immigrant_list = []
+        for parts in received:
+            if not parts:
+                immigrant_list.append(None)
+                continue
+            individuals = np.concatenate([part[0] for part in parts])
+            fitness = np.concatenate([part[1] for part in parts])
+            order = np.argsort(
+                fitness if self.island_class.minimize else -fitness,
+                kind="stable"
+            )[:self.migration_size]
+            immigrant_list.append((individuals[order], fitness[order]))
+        return immigrant_list
+
+    def update_best(self, best_list):
+        """ Keep the best of the islands' bests.
+
+        :param best_list: (individual, fitness) of each island
+        :type best_list: list
+        """
+        for island, (individual, fitness) in enumerate(best_list):
+            if (
+                self.best_fitness is None
+                or (fitness < self.best_fitness if self.island_class.minimize
+                    else fitness > self.best_fitness)
+            ):
+                self.best = individual
+                self.best_fitness = float(fitness)
+                self.best_island = island
+        self.history.append(self.best_fitness)
+
+    def run(self, epochs):
+        """ Run epochs rounds of migration_interval generations on every
+        island, migrating between rounds.
+
+        :param epochs: Number of rounds
+        :type epochs: int
+        :return: Best individual over all islands and its fitness
+        :rtype: tuple
+        """
+        connections = []
+        workers = []
+        for island in range(self.islands):
+            driver_end, worker_end = Pipe()
+            worker = Process(
+                target=_island_worker,
+                args=(worker_end, self.island_class, self.island_options,
+                      self.island_seeds[island]),
+                daemon=True
+            )
+            worker.start()
+            worker_end.close()
+            connections.append(driver_end)
+            workers.append(worker)
+        try:
+            immigrant_list = [None] * self.islands
+            for _ in range(epochs):
+                for connection, immigrants in zip(connections, immigrant_list):
+                    connection.send((
+                        immigrants, self.migration_interval,
+                        self.migration_size
+                    ))
+                replies = [
+                    _receive(connection, island)
+                    for island, connection in enumerate(connections)
+                ]
+                self.update_best([best for _, best in replies])
+                immigrant_list = self.route(
+                    [emigrants for emigrants, _ in replies]
+                )
+        finally:
+            for connection in connections:
+                connection.send(None)
+                connection.close()
+            for worker in workers:
+                worker.join()
+        return self.best, self.best_fitness
@@ -0,0 +1,24 @@
+"""
+Makes the Genetic and differential_evolution script directories importable
+from the modules next to this file.
+
+The two directories hold flat scripts that import their neighbours by plain
+module name (from chromosome import Chromosome), so they are added to sys.path
+rather than turned into packages. Import this module before any of them:
+
+    import paths  # noqa: F401
+    from genetic import Genetic
+"""
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIES = [
+    os.path.join(HERE, directory)
+    for directory in ("Genetic", "differential_evolution")
+]
+
+for _directory in DIRECTORIES:
+    if _directory not in sys.path:
+        sys.path.append(_directory)
@@ -0,0 +1,251 @@
+"""
+Population and fitness buffers in multiprocessing.shared_memory.
+
+A SharedArray is a numpy array whose data lives in a named shared memory
+block. Its descriptor, (name, shape, dtype), is a few bytes that any process
+can use to attach the same memory, so worker processes read candidate rows
+and write fitness slots in place instead of receiving pickled copies.
+
+SharedMemoryEvaluator uses this for the engines' evaluator argument: each
+batch is copied once into a shared population block and the workers only
+receive (descriptor, start, stop) messages.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from evaluator import PoolEvaluator
+
+
+class SharedArray():
+    """ Numpy array backed by a shared memory block.
+
+    """
+    def __init__(self, shm, shape, dtype, owner):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        self.array = np.ndarray(self.shape, self.dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, shape, dtype=float):
+        """ Allocate a new shared block.
+
+        :param shape: Shape of the array
+        :type shape: tuple
+        :param dtype: Type of the items, defaults to float
+        :type dtype: numpy.dtype, optional
+        :return: Array owned by this process, which unlinks it on close
+        :rtype: SharedArray
+        """
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        return cls(shm, shape, dtype, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor):
+        """ Attach a block created by another process.
+
+        :param descriptor: descriptor of the array
+        :type descriptor: tuple
+        :return: View of the same memory
+        :rtype: SharedArray
+        """
+        name, shape, dtype = descriptor
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype,
+                   owner=False)
+
+    @property
+    def descriptor(self):
+        """ (name, shape, dtype) identifying the array across processes.
+
+        :return: Descriptor of the array
+        :rtype: tuple
+        """
+        return self.shm.name, self.shape, self.dtype.str
+
+    def close(self):
+        """ Detach from the block, and free it if this process created it.
+
+        :return: NoneType
+        :rtype: NoneType
+        """
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SharedPopulation():
+    """ A (size x dimension) population and its fitness vector in shared
+    memory.
+
+    """
+    def __init__(self, population, fitness):
+        self.shared_population = population
+        self.shared_fitness = fitness
+        self.population = population.array
+        self.fitness = fitness.array
+
+    @classmethod
+    def create(cls, size, dimension, dtype=float):
+        """ Allocate the population and fitness blocks.
+
+        :param size: Number of individuals
+        :type size: int
+        :param dimension: Genes (or coordinates) of each individual
+        :type dimension: int
+        :param dtype: Type of the genes, e.g. numpy.uint8 for the genetic
+        algorithm, defaults to float
+        :type dtype: numpy.dtype, optional
+        :return: Shared population owned by this process
+        :rtype: SharedPopulation
+        """
+        return cls(SharedArray.create((size, dimension), dtype),
+                   SharedArray.create((size,), float))
+
+    @classmethod
+    def attach(cls, descriptor):
+        """ Attach the blocks of a population created by another process.
+
+        :param descriptor: descriptor of the population
+        :type descriptor: tuple
+        :return: Shared population view
+        :rtype: SharedPopulation
+        """
+        population, fitness = descriptor
+        return cls(SharedArray.attach(population), SharedArray.attach(fitness))
+
+    @property
+    def descriptor(self):
+        """ Descriptors of the population and fitness arrays.
+
+        :return: Descriptor of the population
+        :rtype: tuple
+        """
+        return (self.shared_population.descriptor,
+                self.shared_fitness.descriptor)
+
+    def close(self):
+        """ Detach, and free the blocks if this process created them.
+
+        :return: NoneType
+        :rtype: NoneType
+        """
+        self.population = self.fitness = None
+        self.shared_population.close()
+        self.shared_fitness.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Shared population a worker process has attached, by descriptor, so a block
+# is mapped once per worker rather than once per task
+_attached = {}
+
+
+def _evaluate_rows(function, descriptor, start, stop, vectorized):
+    """ Evaluate rows start:stop of a shared population in a worker and write
+    their fitness in place.
+
+    """
+    shared = _attached.get(descriptor)
+    if shared is None:
+        # The evaluator replaced its block, unmap the old one
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        shared = _attached[descriptor] = SharedPopulation.attach(descriptor)
+    rows = shared.population[start:stop]
+    if vectorized:
+        shared.fitness[start:stop] = np.asarray(function(rows), dtype=float)
+    else:
+        for offset, row in enumerate(rows):
+            shared.fitness[start + offset] = function(row)
+
+
+class SharedMemoryEvaluator(PoolEvaluator):
+    """ Process pool evaluator passing candidates through shared memory.
+
+    A batch is copied once into a shared population block, grown when a
+    larger batch arrives, and every task is only (descriptor, start, stop).
+
+    """
+    def __init__(self, workers=None, chunk_size=None):
+        """
+        :param workers: Number of worker processes, defaults to None (the
+        executor's default)
+        :type workers: int, optional
+        :param chunk_size: Rows in one task, defaults to None (the batch split
+        evenly over the workers)
+        :type chunk_size: int, optional
+        """
+        super().__init__(workers, "process", chunk_size)
+        self.shared = None
+
+    def get_shared(self, candidates):
+        """ Shared population able to hold the candidates.
+
+        :param candidates: Batch about to be evaluated
+        :type candidates: numpy.ndarray
+        :return: Shared population with at least len(candidates) rows
+        :rtype: SharedPopulation
+        """
+        size, dimension = candidates.shape
+        shared = self.shared
+        if (
+            shared is None
+            or shared.population.shape[0] < size
+            or shared.population.shape[1] != dimension
+            or shared.population.dtype != candidates.dtype
+        ):
+            self.release_shared()
+            shared = self.shared = SharedPopulation.create(
+                size, dimension, candidates.dtype
+            )
+        return shared
+
+    def release_shared(self):
+        # Workers still mapping the block keep it alive until they move on
+        # to the next one
+        if self.shared is not None:
+            self.shared.close()
+            self.shared = None
+
+    def evaluate(self, function, candidates, vectorized=False):
+        candidates = np.asarray(candidates)
+        if len(candidates) == 0:
+            return np.empty(0)
+        if candidates.ndim == 1:
+            candidates = candidates[:, np.newaxis]
+        executor = self.get_executor()
+        shared = self.get_shared(candidates)
+        size = len(candidates)
+        shared.population[:size] = candidates
+        chunk_size = self.get_chunk_size(size)
+        futures = [
+            executor.submit(
+                _evaluate_rows, function, shared.descriptor, start,
+                min(start + chunk_size, size), vectorized
+            )
+            for start in range(0, size, chunk_size)
+        ]
+        for future in futures:
+            future.result()
+        return shared.fitness[:size].copy()
+
+    def close(self):
+        self.release_shared()
+        super().close()
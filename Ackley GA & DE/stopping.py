@@ -0,0 +1,253 @@
+"""
+Stopping criteria shared by the genetic algorithm (Genetic/genetic.py) and
+differential evolution (differential_evolution/differentialEvolution.py).
+
+The criteria here combine into one with AnyOf or AllOf and are passed as the
+stopping argument of an engine, which calls start() when the run begins and
+check(state) once per generation with a dict describing the run:
+
+    generation   -- number of generations finished
+    evaluations  -- number of fitness evaluations so far
+    best_fitness -- best fitness found so far
+    population   -- current population matrix, one individual per row
+    fitness      -- fitness of each row of population
+    minimize     -- True when lower fitness is better (DE), False for the GA
+
+After the run, the fired attribute of the criterion describes what stopped it.
+"""
+
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class StoppingCriterion(ABC):
+    """ Base class of stopping criteria. Subclasses implement test and
+    usually describe; check, start and the | and & operators come from here.
+
+    """
+    def __init__(self):
+        self.fired = None
+
+    def start(self):
+        """ Reset the criterion at the beginning of a run.
+
+        :return: NoneType
+        :rtype: NoneType
+        """
+        self.fired = None
+
+    def check(self, state):
+        """ Decide whether the run should stop.
+
+        :param state: Run state described in the module docstring
+        :type state: dict
+        :return: Description of the fired criterion, or None to continue
+        :rtype: str
+        """
+        if self.test(state):
+            self.fired = self.describe()
+        else:
+            self.fired = None
+        return self.fired
+
+    @abstractmethod
+    def test(self, state):
+        """ Test the criterion on the state of one generation. Called once
+        per generation, so stateful criteria may update themselves here.
+
+        :param state: Run state described in the module docstring
+        :type state: dict
+        :return: Whether the run should stop
+        :rtype: bool
+        """
+
+    def describe(self):
+        """ Describe the criterion once it has fired. check stores it in
+        fired and Genetic.run in stopped_by.
+
+        :return: Description, defaults to the class name
+        :rtype: str
+        """
+        return type(self).__name__
+
+    def __or__(self, other):
+        return AnyOf(self, other)
+
+    def __and__(self, other):
+        return AllOf(self, other)
+
+
+class TargetFitness(StoppingCriterion):
+    """ Stop once the best fitness reaches a target value.
+
+    """
+    def __init__(self, target):
+        """
+        :param target: Fitness to reach, at most target when minimizing and
+        at least target when maximizing
+        :type target: float
+        """
+        super().__init__()
+        self.target = target
+
+    def test(self, state):
+        if state["minimize"]:
+            return state["best_fitness"] <= self.target
+        return state["best_fitness"] >= self.target
+
+    def describe(self):
+        return f"target fitness {self.target}"
+
+
+class Stagnation(StoppingCriterion):
+    """ Stop when the best fitness has not improved for a number of
+    generations.
+
+    """
+    def __init__(self, generations, tolerance=0.0):
+        """
+        :param generations: Generations allowed without improvement
+        :type generations: int
+        :param tolerance: Smallest change counted as an improvement, defaults
+        to 0.0
+        :type tolerance: float, optional
+        """
+        super().__init__()
+        self.generations = generations
+        self.tolerance = tolerance
+        self.best = None
+        self.last_improvement = 0
+
+    def start(self):
+        super().start()
+        self.best = None
+        self.last_improvement = 0
+
+    def test(self, state):
+        best = state["best_fitness"]
+        if state["minimize"]:
+            best = -best
+        if self.best is None or best > self.best + self.tolerance:
+            self.best = best
+            self.last_improvement = state["generation"]
+        return state["generation"] - self.last_improvement >= self.generations
+
+    def describe(self):
+        return f"stagnation over {self.generations} generations"
+
+
+class DiversityBelow(StoppingCriterion):
+    """ Stop when the population has collapsed, diversity being the mean
+    standard deviation of the genes (or coordinates) over the population.
+
+    """
+    def __init__(self, threshold):
+        """
+        :param threshold: Diversity under which the run stops
+        :type threshold: float
+        """
+        super().__init__()
+        self.threshold = threshold
+
+    @staticmethod
+    def diversity(population):
+        """ Mean over genes of the standard deviation across individuals.
+
+        :param population: One individual per row
+        :type population: numpy.ndarray
+        :return: Diversity of the population
+        :rtype: float
+        """
+        return float(np.mean(np.std(population, axis=0)))
+
+    def test(self, state):
+        return DiversityBelow.diversity(state["population"]) < self.threshold
+
+    def describe(self):
+        return f"diversity below {self.threshold}"
+
+
+class WallClock(StoppingCriterion):
+    """ Stop after a number of seconds since start().
+
+    """
+    def __init__(self, seconds):
+        """
+        :param seconds: Time budget of the run
+        :type seconds: float
+        """
+        super().__init__()
+        self.seconds = seconds
+        self.started = None
+
+    def start(self):
+        super().start()
+        self.started = time.perf_counter()
+
+    def test(self, state):
+        return time.perf_counter() - self.started >= self.seconds
+
+    def describe(self):
+        return f"wall clock {self.seconds}s"
+
+
+class EvaluationBudget(StoppingCriterion):
+    """ Stop once a number of fitness evaluations has been spent.
+
+    """
+    def __init__(self, evaluations):
+        """
+        :param evaluations: Evaluation budget of the run
+        :type evaluations: int
+        """
+        super().__init__()
+        self.evaluations = evaluations
+
+    def test(self, state):
+        return state["evaluations"] >= self.evaluations
+
+    def describe(self):
+        return f"evaluation budget {self.evaluations}"
+
+
+class AnyOf(StoppingCriterion):
+    """ Stop when any of the criteria fires.
+
+    """
+    def __init__(self, *criteria):
+        super().__init__()
+        self.criteria = criteria
+        self.fired_criteria = []
+
+    def start(self):
+        super().start()
+        self.fired_criteria = []
+        for criterion in self.criteria:
+            criterion.start()
+
+    def test(self, state):
+        # Every criterion is checked so stateful ones (stagnation) see each
+        # generation
+        fired = [criterion.check(state) for criterion in self.criteria]
+        self.fired_criteria = [description for description in fired
+                               if description]
+        return bool(self.fired_criteria)
+
+    def describe(self):
+        return self.fired_criteria[0]
+
+
+class AllOf(AnyOf):
+    """ Stop when all of the criteria fire in the same generation.
+
+    """
+    def test(self, state):
+        fired = [criterion.check(state) for criterion in self.criteria]
+        self.fired_criteria = [description for description in fired
+                               if description]
+        return len(self.fired_criteria) == len(self.criteria)
+
+    def describe(self):
+        return " and ".join(self.fired_criteria)
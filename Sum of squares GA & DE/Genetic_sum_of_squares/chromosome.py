@@ -4,9 +4,26 @@ single-point, n-point and uniform. Each chromosome could be initialized by
 calling random or form_gen_list classmethod.
 """
 
-import random
+import functools
 import math
 
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def get_phenotype_weights(length):
+    """ Power-of-two weight of each gene when decoding ``length`` genes, the
+    first gene is the least significant bit.
+
+    :param length: Number of genes in one phenotype value
+    :type length: int
+    :return: Weight vector
+    :rtype: numpy.ndarray
+    """
+    weights = 2.0 ** np.arange(length)
+    weights.flags.writeable = False
+    return weights
+
 
 class Chromosome():
     """ Representation of a chromosome in both phenotype and genotype.
@@ -17,10 +34,22 @@ class Chromosome():
         self.minimum = minimum
         self.maximum = maximum
         self.genotype = genotype
-        self.fitness = self.calculate_fitness()
+        self._fitness = None
+
+    @property
+    def fitness(self):
+        """ Fitness of the chromosome. It is calculated on first access and
+        cached until a gene is changed through indexing or mutation.
+
+        :return: Fitness of the chromosome
+        :rtype: float
+        """
+        if self._fitness is None:
+            self._fitness = self.calculate_fitness()
+        return self._fitness
 
     @classmethod
-    def random(cls, size, minimum=-5, maximum=5):
+    def random(cls, size, minimum=-5, maximum=5, rng=None):
         """ Create a random chromosome instance.
 
         :param size: Size of chromosome
@@ -29,15 +58,17 @@ class Chromosome():
         :type minimum: int, optional
         :param maximum: Maximum value in phenotype, defaults to 5
         :type maximum: int, optional
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: An instance of chromosome class
         :rtype: Chromosome
         """
         if size % 2 == 1:
             print("size can't be odd, increasing by 1 automatically")
             size += 1
-        genotype = []
-        for _ in range(size):
-            genotype.append(bool(random.getrandbits(1)))
+        rng = np.random.default_rng(rng)
+        genotype = rng.integers(0, 2, size).astype(bool).tolist()
         return cls(genotype, minimum, maximum)
 
     @classmethod
@@ -68,28 +99,58 @@ class Chromosome():
         return 1 if self.genotype[key] else 0
 
     def __setitem__(self, key, value):
-        self.genotype[key] = bool(int(value))
+        gen = bool(int(value))
+        if self.genotype[key] != gen:
+            self.genotype[key] = gen
+            self._fitness = None
 
     def __calculate_phenotype_value(self, gen_list):
-        raw_value = 0
-        for i, gen in enumerate(gen_list):
-            raw_value += gen * (2 ** i)
+        raw_value = float(
+            np.dot(gen_list, get_phenotype_weights(len(gen_list)))
+        )
         return (
             raw_value *
             ((self.maximum - self.minimum) / ((2 ** len(gen_list)) - 1))
             + self.minimum
         )
 
-    def __get_random_split_point_list(self, count):
+    @staticmethod
+    def decode_batch(genotypes, minimum=-5, maximum=5):
+        """ Decode x and y of many genotypes with one dot product per axis.
+
+        :param genotypes: Bit matrix, one genotype in each row
+        :type genotypes: numpy.ndarray
+        :param minimum: Minimum value in phenotype, defaults to -5
+        :type minimum: int, optional
+        :param maximum: Maximum value in phenotype, defaults to 5
+        :type maximum: int, optional
+        :return: A tuple of x and y arrays
+        :rtype: tuple
+        """
+        genotypes = np.asarray(genotypes, dtype=np.uint8)
+        half = genotypes.shape[-1] // 2
+        # Like get_x and get_y, y takes the extra gene of an odd genotype
+        return tuple(
+            genes @ get_phenotype_weights(genes.shape[-1])
+            * ((maximum - minimum) / ((2 ** genes.shape[-1]) - 1)) + minimum
+            for genes in (genotypes[..., :half], genotypes[..., half:])
+        )
+
+    def __get_random_split_point_list(self, count, rng=None):
         """ Generate random unique split points.
 
         :param count: Number of split points needed.
         :type count: int
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: Sorted list of random split points
         :rtype: list
         """
-        split_point_list = random.sample(range(1, self.size), count)
-        split_point_list.sort()
+        rng = np.random.default_rng(rng)
+        split_point_list = np.sort(
+            rng.choice(np.arange(1, self.size), count, replace=False)
+        ).tolist()
         split_point_list.insert(0, 0)
         split_point_list.append(self.size)
         return split_point_list
@@ -100,8 +161,21 @@ class Chromosome():
         :return: sumsquare function output
         :rtype: float
         """
-        sumsq_x = self.get_x()
-        sumsq_y = self.get_y()    
+        return float(
+            Chromosome.sumsq_function(self.get_x(), self.get_y())
+        )
+
+    @staticmethod
+    def sumsq_function(sumsq_x, sumsq_y):
+        """ Calculate sumsquare function element-wise over x and y arrays.
+
+        :param sumsq_x: Values of x
+        :type sumsq_x: numpy.ndarray
+        :param sumsq_y: Values of y
+        :type sumsq_y: numpy.ndarray
+        :return: sumsquare function output
+        :rtype: numpy.ndarray
+        """
         return (1 * sumsq_x**2) + (2 * sumsq_y**2)
 
     def calculate_fitness(self, base=21):
@@ -116,6 +190,26 @@ class Chromosome():
         """
         return base - self.calculate_sumsq_function()
 
+    @classmethod
+    def evaluate_batch(cls, genotypes, minimum=-5, maximum=5, base=21):
+        """ Calculate fitness of many genotypes in one call, without creating
+        a chromosome for each of them.
+
+        :param genotypes: Bit matrix, one genotype in each row
+        :type genotypes: numpy.ndarray
+        :param minimum: Minimum value in phenotype, defaults to -5
+        :type minimum: int, optional
+        :param maximum: Maximum value in phenotype, defaults to 5
+        :type maximum: int, optional
+        :param base: Base of our fitness calculation, defaults to 21
+        :type base: int, optional
+        :return: Fitness of each genotype
+        :rtype: numpy.ndarray
+        """
+        return base - cls.sumsq_function(
+            *cls.decode_batch(genotypes, minimum, maximum)
+        )
+
     def general_crossover(self, second_parent, split_point_list):
         """ Crossover with two parent chromosome and produce two children.
 
@@ -142,43 +236,54 @@ class Chromosome():
             self.from_gen_list(first_child), self.from_gen_list(second_child)
         )
 
-    def single_point_crossover(self, second_parent):
+    def single_point_crossover(self, second_parent, rng=None):
         """ Single point crossover.
 
         :param second_parent: Second parent
         :type second_parent: Chromosome
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: A tuple containing two children
         :rtype: tuple
         """
-        split_point_list = self.__get_random_split_point_list(1)
+        split_point_list = self.__get_random_split_point_list(1, rng)
         return self.general_crossover(second_parent, split_point_list)
 
-    def n_point_crossover(self, second_parent, count):
+    def n_point_crossover(self, second_parent, count, rng=None):
         """ N-Point crossover.
 
         :param second_parent: Second parent
         :type second_parent: Chromosome
         :param count: Number of split points
         :type count: int
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: A tuple containing two children
         :rtype: tuple
         """
-        split_point_list = self.__get_random_split_point_list(count)
+        split_point_list = self.__get_random_split_point_list(count, rng)
         return self.general_crossover(second_parent, split_point_list)
 
-    def uniform_crossover(self, second_parent):
+    def uniform_crossover(self, second_parent, rng=None):
         """ Uniform crossover, each bit is chosen from either parent.
 
         :param second_parent: Second parent
         :type second_parent: Chromosome
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: A tuple containing two children
         :rtype: tuple
         """
+        rng = np.random.default_rng(rng)
         first_parent = self
         first_child = []
         second_child = []
-        for i, j in zip(first_parent, second_parent):
-            if bool(random.getrandbits(1)):
+        bits = rng.integers(0, 2, self.size).tolist()
+        for i, j, bit in zip(first_parent, second_parent, bits):
+            if bit:
                 first_child.append(i)
                 second_child.append(j)
             else:
@@ -188,38 +293,48 @@ class Chromosome():
             self.from_gen_list(first_child), self.from_gen_list(second_child)
         )
 
-    def crossover(self, second_parent, method):
+    def crossover(self, second_parent, method, rng=None):
         """ Crossover with chosen method (n_point, single_point, uniform).
 
         :param second_parent: Second parent
         :type second_parent: Chromosome
         :param method: Method for crossover
         :type method: str
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         """
         if method == "uniform":
-            return self.uniform_crossover(second_parent)
+            return self.uniform_crossover(second_parent, rng)
         if method.split('_')[0] == "single":
-            return self.single_point_crossover(second_parent)
+            return self.single_point_crossover(second_parent, rng)
         if method.split('_')[0].isnumeric():
             return self.n_point_crossover(
-                second_parent, int(method.split('_')[0])
+                second_parent, int(method.split('_')[0]), rng
             )
         return False
 
-    def mutation(self, selection_probability, gene_probability):
+    def mutation(self, selection_probability, gene_probability, rng=None):
         """ Perform mutation on chromosome
 
         :param selection_probability: Probability of selecting a chromosome
         :type selection_probability: float
         :param gene_probability: Probability of changing each gene
         :type gene_probability: float
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         """
-        if random.random() > selection_probability:
+        rng = np.random.default_rng(rng)
+        if rng.random() > selection_probability:
             return
-        for i in range(self.size):
-            if random.random() <= gene_probability:
-                self.genotype[i] = not self.genotype[i]
-        self.fitness = self.calculate_fitness()
+        position_list = np.flatnonzero(
+            rng.random(self.size) <= gene_probability
+        ).tolist()
+        for i in position_list:
+            self.genotype[i] = not self.genotype[i]
+        if position_list:
+            self._fitness = None
 
     def get_x(self):
         """ Get value of x in phenotype space.
@@ -2,7 +2,9 @@
 Genetic algorithm implementation for Ackley function.
 """
 
-import random
+from functools import partial
+
+import numpy as np
 
 from chromosome import Chromosome
 
@@ -12,7 +14,10 @@ class Genetic:
 
     """
 
-    def __init__(self, chromosome_size, population_size, generation_count):
+    def __init__(
+            self, chromosome_size, population_size, generation_count,
+            evaluator=None, rng=None
+    ):
         """ Initialize an instance of genetic class.
         :param chromosome_size: Size of each binary chromosome.
         :type chromosome_size: int
@@ -20,11 +25,23 @@ class Genetic:
         :type population_size: int
         :param generation_count: Number of generations
         :type generation_count: int
+        :param evaluator: Evaluator the fitness of new chromosomes is sent to
+        in one batch per generation, any object with evaluate(function,
+        candidates, vectorized) such as the ones in evaluator.py of Ackley GA
+        & DE, defaults to None (each chromosome calculates its own fitness)
+        :type evaluator: PoolEvaluator, optional
+        :param rng: Random generator, or a seed (int or
+        numpy.random.SeedSequence) to create one from, every random draw of
+        the run comes from it, defaults to None (a fresh unseeded generator)
+        :type rng: numpy.random.Generator, optional
         """
         self.chromosome_size = chromosome_size
         self.population_size = population_size
         self.generation_count = generation_count
+        self.evaluator = evaluator
+        self.rng = np.random.default_rng(rng)
         self.current_generation = self.initialize_population()
+        self.evaluate(self.current_generation)
         self.next_generation = list()
         self.generation_max_fitness = list()
         self.generation_average_fitness = list()
@@ -42,10 +59,34 @@ class Genetic:
         :rtype: list
         """
         return [
-            Chromosome.random(self.chromosome_size)
+            Chromosome.random(self.chromosome_size, rng=self.rng)
             for _ in range(self.population_size)
         ]
 
+    def evaluate(self, chromosome_list):
+        """ Calculate the fitness of the chromosomes that do not know it yet
+        with one evaluator call, without an evaluator it is calculated lazily
+        by each chromosome.
+
+        :param chromosome_list: Chromosomes to evaluate
+        :type chromosome_list: list
+        :return: NoneType
+        :rtype: NoneType
+        """
+        stale = [c for c in chromosome_list if c._fitness is None]
+        if self.evaluator is None or not stale:
+            return
+        fitness = self.evaluator.evaluate(
+            partial(
+                Chromosome.evaluate_batch, minimum=stale[0].minimum,
+                maximum=stale[0].maximum
+            ),
+            np.array([c.genotype for c in stale], dtype=np.uint8),
+            vectorized=True
+        )
+        for chromosome, value in zip(stale, fitness):
+            chromosome._fitness = float(value)
+
     def run(
             self, crossover_method="3_point",
             parent_selection_method="rws",
@@ -87,29 +128,39 @@ class Genetic:
             selected_parent_list = self.parent_selection(
                 parent_selection_method
             )
+            family_list = []
             for i in range(0, len(selected_parent_list), 2):
                 offspring_list = []
                 offspring_list.extend(
                     selected_parent_list[i].crossover(
                         selected_parent_list[i+1],
-                        crossover_method
+                        crossover_method,
+                        self.rng
                     )
                 )
                 offspring_list[0].mutation(
                     mutation_selection_probability,
-                    mutation_gene_probability
+                    mutation_gene_probability,
+                    self.rng
                 )
                 offspring_list[1].mutation(
                     mutation_selection_probability,
-                    mutation_gene_probability
+                    mutation_gene_probability,
+                    self.rng
                 )
+                family_list.append(offspring_list + [
+                    selected_parent_list[i],
+                    selected_parent_list[i+1]
+                ])
+            # Every child of the generation is evaluated in one batch before
+            # the families are selected from
+            self.evaluate([c for family in family_list for c in family])
+            for family in family_list:
                 self.next_generation.extend(
                     self.survival_selection(
-                        offspring_list + [
-                            selected_parent_list[i],
-                            selected_parent_list[i+1]
-                        ],
-                        survival_selection_method
+                        family,
+                        survival_selection_method,
+                        self.rng
                     )
                 )
             self.go_to_the_future()
@@ -134,7 +185,8 @@ class Genetic:
         return Genetic.selection(
             self.current_generation,
             self.population_size,
-            parent_selection_method
+            parent_selection_method,
+            self.rng
         )
 
     def go_to_the_future(self):
@@ -147,7 +199,9 @@ class Genetic:
         self.next_generation = list()
 
     @staticmethod
-    def survival_selection(chromosome_list, survival_selection_method):
+    def survival_selection(
+            chromosome_list, survival_selection_method, rng=None
+    ):
         """ Survival selection based on selection method.
 
         :param chromosome_list: Chromosome list to select from
@@ -155,6 +209,9 @@ class Genetic:
         :param survival_selection_method: Survival selection method (rws, sus,
         ts, rb)
         :type survival_selection_method: str
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: List of chromosomes, to be the survivals of the next
         generation
         :rtype: list
@@ -162,11 +219,12 @@ class Genetic:
         return Genetic.selection(
             chromosome_list,
             2,
-            survival_selection_method
+            survival_selection_method,
+            rng
         )
 
     @staticmethod
-    def selection(chromosome_list, size, selection_method):
+    def selection(chromosome_list, size, selection_method, rng=None):
         """ Select chromosomes based on selection method.
 
         :param chromosome_list: Chromosome list to select from
@@ -175,29 +233,36 @@ class Genetic:
         :type size: int
         :param selection_method: Selection method (rws, sus, ts, rb, elitism)
         :type selection_method: str
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: List of selected chromosomes
         :rtype: list
         """
+        rng = np.random.default_rng(rng)
         if selection_method == "rws":
             return [
-                Genetic.roulette_wheal_selection(chromosome_list)
+                Genetic.roulette_wheal_selection(chromosome_list, rng)
                 for _ in range(size)
             ]
         if selection_method == "rb":
             return [
-                Genetic.rank_based_selection(chromosome_list)
+                Genetic.rank_based_selection(chromosome_list, rng)
                 for _ in range(size)
             ]
         if selection_method[0:2] == "ts":
             return [
                 Genetic.tournament_selection(
                     chromosome_list,
-                    int(selection_method.split('_')[1])
+                    int(selection_method.split('_')[1]),
+                    rng
                 )
                 for _ in range(size)
             ]
         if selection_method == "sus":
-            return Genetic.stochastic_universal_sampling(chromosome_list, size)
+            return Genetic.stochastic_universal_sampling(
+                chromosome_list, size, rng
+            )
         if selection_method == "elitism":
             chromosome_list.sort(reverse=True, key=lambda c: c.fitness)
             return [
@@ -218,17 +283,21 @@ class Genetic:
         return summation
 
     @staticmethod
-    def rank_based_selection(chromosome_list):
+    def rank_based_selection(chromosome_list, rng=None):
         """ Select a chromosome based on rank selection (rb)
 
         :param chromosome_list: List of chromosome
         :type chromosome_list: list
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: Selected chromosome based on rank selection
         :rtype: Chromosome
         """
+        rng = np.random.default_rng(rng)
         chromosome_list.sort(key=lambda c: c.fitness)
         rank_sum = ((1 + len(chromosome_list)) * len(chromosome_list)) / 2
-        random_float = random.uniform(0, rank_sum)
+        random_float = rank_sum * rng.random()
         for i, chromosome in enumerate(chromosome_list):
             random_float -= i + 1
             if random_float <= 0:
@@ -236,16 +305,20 @@ class Genetic:
         return chromosome_list[-1]
 
     @staticmethod
-    def roulette_wheal_selection(chromosome_list):
+    def roulette_wheal_selection(chromosome_list, rng=None):
         """ Select a chromosome based on roulette wheal selection (rws)
 
         :param chromosome_list: List of chromosome
         :type chromosome_list: list
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: Selected chromosome based on roulette wheal selection
         :rtype: Chromosome
         """
+        rng = np.random.default_rng(rng)
         fitness_sum = Genetic.fitness_sum(chromosome_list)
-        random_float = random.uniform(0, fitness_sum)
+        random_float = fitness_sum * rng.random()
         for chromosome in chromosome_list:
             random_float -= chromosome.fitness
             if random_float <= 0:
@@ -253,21 +326,28 @@ class Genetic:
         return chromosome_list[-1]
 
     @staticmethod
-    def tournament_selection(chromosome_list, size):
+    def tournament_selection(chromosome_list, size, rng=None):
         """ Select a chromosome based on tournament selection (ts_n)
 
         :param chromosome_list: List of chromosome
         :type chromosome_list: list
         :param size: Size of tournament
         :type size: int
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
         :return: Selected chromosome based on tournament selection
         :rtype: Chromosome
         """
-        tournament = random.sample(chromosome_list, k=size)
+        rng = np.random.default_rng(rng)
+        tournament = [
+            chromosome_list[i]
+            for i in rng.choice(len(chromosome_list), size, replace=False)
+        ]
         return max(tournament, key=lambda c: c.fitness)
 
     @staticmethod
-    def stochastic_universal_sampling(chromosome_list, size):
+    def stochastic_universal_sampling(chromosome_list, size, rng=None):
         """ Select a list of chromosome based on stochastic universal sampling
         (sus)
 
@@ -275,11 +355,22 @@ class Genetic:
         :type chromosome_list: list
         :param size: Size of chromosome list to be selected
         :type size: int
+        :param rng: Random generator (or seed), defaults to None (a fresh
+        unseeded generator)
+        :type rng: numpy.random.Generator, optional
+        :raises ValueError: If the fitness sum is not positive, the pointers
+        would then move away from every chromosome and never select one
         :return: Selected chromosome based on stochastic universal sampling
         :rtype: Chromosome
         """
+        rng = np.random.default_rng(rng)
         fitness_sum = Genetic.fitness_sum(chromosome_list)
-        random_float = random.uniform(0, fitness_sum)
+        if fitness_sum <= 0:
+            raise ValueError(
+                "sus needs a positive fitness sum, got "
+                f"{fitness_sum}; use rws, rb, ts_n or elitism instead"
+            )
+        random_float = fitness_sum * rng.random()
         distance = fitness_sum / size
         selected_chromosome_list = list()
         while True:
@@ -290,7 +381,7 @@ class Genetic:
                     if len(selected_chromosome_list) == size:
                         return selected_chromosome_list
                     random_float = distance + random_float
-        return random.shuffle(selected_chromosome_list)
+        return rng.shuffle(selected_chromosome_list)
 
     @staticmethod
     def find_best_chromosome(chromosome_list):
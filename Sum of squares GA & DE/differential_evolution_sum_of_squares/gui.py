@@ -1,10 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
-import random
 import math
 import matplotlib.pyplot as plt
-from main import DE  # Assuming your DE algorithm is in a file named DE_algorithm.py
+from main import DE, sum_of_squares  # Assuming your DE algorithm is in a file named DE_algorithm.py
 
 
 class DEGUI:
@@ -74,7 +73,7 @@ class DEGUI:
         # Run DE algorithm
         de = DE(x=x_strategy, y=y_vectors, z=z_scheme, F=F_weight, CR=CR_probability)
         bound = 10  # Adjust bound based on your requirement
-        pop = [[random.uniform(-bound, bound) for _ in range(2)] for _ in range(population_size)]
+        pop = de.rng.uniform(-bound, bound, (population_size, 2)).tolist()
 
         best_solution, best_fitnesses = de.solve(sum_of_squares, pop, iterations=max_generations)
 
@@ -90,10 +89,6 @@ class DEGUI:
         plt.show()
 
 
-def sum_of_squares(*args):
-    return sum(x ** 2 for x in args)
-
-
 if __name__ == "__main__":
     root = tk.Tk()
     app = DEGUI(root)
@@ -1,32 +1,75 @@
 import collections
-import random
+import os
+import sys
+
 import matplotlib.pyplot as plt
+import numpy as np
+
+# The donor sampler and the objective are the ones of the Ackley differential evolution, kept in a
+# single sampling.py and test_function.py
+_SHARED_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'Ackley GA & DE', 'differential_evolution')
+if _SHARED_DIRECTORY not in sys.path:
+    sys.path.append(_SHARED_DIRECTORY)
 
-__all__ = ['DE']
+from sampling import sample_without_replacement  # noqa: E402
+from test_function import SumOfSquares  # noqa: E402
+
+__all__ = ['DE', 'sum_of_squares']
 Individual = collections.namedtuple('Individual', 'ind fit')
 
 
+class _Unpacked(object):
+    """Calls fitness(*candidate), picklable so it can be sent to a process pool."""
+
+    def __init__(self, fitness):
+        self.fitness = fitness
+
+    def __call__(self, candidate):
+        return self.fitness(*candidate)
+
+
+def sum_of_squares(*args):
+    # DE.solve calls fitness(*candidate), SumOfSquares takes the coordinates as one sequence
+    return float(SumOfSquares(args))
+
+
 class DE(object):
     """This class implements differential evolution."""
 
-    def __init__(self, x='rand', y=1, z='bin', F=.5, CR=.1):
+    def __init__(self, x='rand', y=1, z='bin', F=.5, CR=.1, backend='numpy', evaluator=None, rng=None):
         self.x = x
         self.y = y
         self.z = z
         self.F = F
         self.CR = CR
+        # 'numpy' keeps the population in one array and runs mutation, crossover and
+        # selection for the whole generation at once, 'python' is the list-based loop
+        self.backend = backend
+        # Optional evaluator (see evaluator.py in Ackley GA & DE) each generation's trials are sent to in
+        # one batch, e.g. a PoolEvaluator to spread them over worker processes
+        self.evaluator = evaluator
+        # Every random draw of both backends comes from this numpy Generator, rng may also be
+        # a seed (int or SeedSequence) to create it from
+        self.rng = np.random.default_rng(rng)
 
     def solve(self, fitness, initial_population, iterations=1000):
-        current_generation = [Individual(ind, fitness(*ind)) for ind in initial_population]
+        if self.backend == 'numpy':
+            return self._solve_numpy(fitness, initial_population, iterations)
+
+        current_generation = [Individual(ind, fit) for ind, fit in
+                              zip(initial_population, self._evaluate(fitness, initial_population))]
         best_fitnesses = []  # To store the best fitness values over iterations
 
         for _ in range(iterations):
-            trial_generation = []
+            trials = []
 
-            for ind in current_generation:
-                v = self._mutate(current_generation)
-                u = self._crossover(ind.ind, v)
-                trial_generation.append(Individual(u, fitness(*u)))
+            for i, ind in enumerate(current_generation):
+                v = self._mutate(current_generation, i)
+                trials.append(self._crossover(ind.ind, v))
+
+            trial_generation = [Individual(u, fit) for u, fit in zip(trials, self._evaluate(fitness, trials))]
 
             current_generation = self._selection(current_generation, trial_generation)
 
@@ -38,12 +81,65 @@ class DE(object):
         best_solution = current_generation[best_index].ind
         return best_solution, best_fitnesses
 
-    def _mutate(self, population):
+    def _solve_numpy(self, fitness, initial_population, iterations):
+        population = np.array(initial_population, dtype=float)
+        fitnesses = np.array(self._evaluate(fitness, population.tolist()), dtype=float)
+        best_fitnesses = []  # To store the best fitness values over iterations
+
+        for _ in range(iterations):
+            mutated = self._mutate_population(population, fitnesses)
+            trial_generation = self._crossover_population(population, mutated)
+            trial_fitnesses = np.array(self._evaluate(fitness, trial_generation.tolist()), dtype=float)
+
+            # Keep the current individual only when it is strictly better, like _selection
+            keep = fitnesses < trial_fitnesses
+            population = np.where(keep[:, None], population, trial_generation)
+            fitnesses = np.where(keep, fitnesses, trial_fitnesses)
+
+            # Track the best fitness value
+            best_fitnesses.append(float(fitnesses.min()))
+
+        best_solution = population[np.argmin(fitnesses)].tolist()
+        return best_solution, best_fitnesses
+
+    def _evaluate(self, fitness, candidates):
+        if self.evaluator is None:
+            return [fitness(*u) for u in candidates]
+        return self.evaluator.evaluate(_Unpacked(fitness), candidates).tolist()
+
+    def _mutate_population(self, population, fitnesses):
+        size = len(population)
+        if self.x == 'rand':
+            r = self._get_population_indices(self.y * 2 + 1, size)
+            base, r = population[r[:, 0]], r[:, 1:]
+        elif self.x == 'best':
+            best = int(np.argmin(fitnesses))
+            r = self._get_population_indices(self.y * 2, size, but=best)
+            base = population[best]
+
+        difference = population[r[:, :self.y]].sum(axis=1) - population[r[:, self.y:]].sum(axis=1)
+        return base + self.F * difference
+
+    def _crossover_population(self, population, mutated):
+        size, dimension = population.shape
+        cross = self.rng.random((size, dimension)) <= self.CR
+        cross[np.arange(size), self.rng.integers(dimension, size=size)] = True  # NP
+        return np.where(cross, mutated, population)
+
+    def _get_population_indices(self, n, size, but=None):
+        # Batched _get_indices: n distinct indices for each of size rows, none of them the row
+        # itself or but
+        excluded = np.arange(size)[:, None]
+        if but is not None:
+            excluded = np.hstack([excluded, np.full((size, 1), but)])
+        return sample_without_replacement(size, (size,), n, self.rng, excluded)
+
+    def _mutate(self, population, i):
         if self.x == 'rand':
-            r1, *r = self._get_indices(self.y * 2 + 1, len(population))
+            r1, *r = self._get_indices(self.y * 2 + 1, len(population), i)
         elif self.x == 'best':
             r1 = self._get_best_index(population)
-            r = self._get_indices(self.y * 2, len(population), but=r1)
+            r = self._get_indices(self.y * 2, len(population), i, but=r1)
 
         mutated = population[r1].ind[:]  # copy base vector
         dimension = len(mutated)
@@ -64,10 +160,10 @@ class DE(object):
 
     def _crossover(self, x, v):
         u = x[:]
-        i = random.randrange(len(x))  # NP
+        i = int(self.rng.integers(len(x)))  # NP
 
         for j, (a, b) in enumerate(zip(x, v)):
-            if i == j or random.random() <= self.CR:
+            if i == j or self.rng.random() <= self.CR:
                 u[j] = v[j]
 
         return u
@@ -83,13 +179,10 @@ class DE(object):
 
         return generation
 
-    def _get_indices(self, n, upto, but=None):
-        candidates = list(range(upto))
-
-        if but is not None:
-            candidates.remove(but)
-
-        return random.sample(candidates, n)
+    def _get_indices(self, n, upto, i, but=None):
+        # n distinct indices below upto, none of them the target i or but
+        excluded = [i] if but is None else [i, but]
+        return sample_without_replacement(upto, (), n, self.rng, excluded).tolist()
 
     def _get_best_index(self, population):
         min_fitness = population[0].fit
@@ -105,9 +198,6 @@ class DE(object):
 if __name__ == '__main__':
     import math
 
-    def sum_of_squares(*args):
-        return sum(x ** 2 for x in args)
-
     # Input parameters from the user
     x_strategy = input("Enter mutation strategy (rand/best): ")
     y_vectors = int(input("Enter the number of difference vectors: "))
@@ -119,7 +209,7 @@ if __name__ == '__main__':
 
     de = DE(x=x_strategy, y=y_vectors, z=z_scheme, F=F_weight, CR=CR_probability)
     bound = 10  # Adjust bound based on your requirement
-    pop = [[random.uniform(-bound, bound) for _ in range(2)] for _ in range(population_size)]
+    pop = de.rng.uniform(-bound, bound, (population_size, 2)).tolist()
 
     best_solution, best_fitnesses = de.solve(sum_of_squares, pop, iterations=max_generations)
 